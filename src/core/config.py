@@ -17,6 +17,11 @@ class Config(BaseSettings):
     neo4j_username: str = Field(..., description="Neo4j username")
     neo4j_password: str = Field(..., description="Neo4j password")
     neo4j_database: str = Field(default="neo4j", description="Neo4j database name")
+    neo4j_max_connection_pool_size: int = Field(default=16, description="Maximum connections in the Neo4j driver pool")
+    neo4j_connection_acquisition_timeout: float = Field(
+        default=30.0,
+        description="Seconds to wait for a free pooled connection before failing"
+    )
     
     # Data file paths
     chalmers_org_file: str = Field(
@@ -3,7 +3,7 @@ Centralized Neo4j client for knowledge graph operations.
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from contextlib import contextmanager
 from neo4j import GraphDatabase, Session
 from neo4j.exceptions import ServiceUnavailable, AuthError
@@ -30,7 +30,9 @@ class Neo4jClient:
             
             self.driver = GraphDatabase.driver(
                 self.config.neo4j_uri,
-                auth=self.config.get_neo4j_auth()
+                auth=self.config.get_neo4j_auth(),
+                max_connection_pool_size=self.config.neo4j_max_connection_pool_size,
+                connection_acquisition_timeout=self.config.neo4j_connection_acquisition_timeout
             )
             
             # Test connection
@@ -70,6 +72,13 @@ class Neo4jClient:
             result = session.run(query, parameters or {})
             return [record.data() for record in result]
     
+    def stream_query(self, query: str, parameters: Optional[Dict] = None) -> Iterator[Dict]:
+        """Execute a query and yield results as dictionaries while they arrive."""
+        with self.session() as session:
+            result = session.run(query, parameters or {})
+            for record in result:
+                yield record.data()
+    
     def execute_write(self, query: str, parameters: Optional[Dict] = None) -> Dict[str, Any]:
         """Execute a write query and return summary statistics."""
         with self.session() as session:
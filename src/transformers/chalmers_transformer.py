@@ -4,14 +4,43 @@ Clean Chalmers organizational structure transformer with self-reference preventi
 
 import json
 import logging
+import sys
+from collections import Counter, deque
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from pydantic import TypeAdapter, ValidationError
+
 from ..models.organization import Organization, OrganizationCreate, OrganizationHierarchy
-from ..utils.validation import clean_organization_data, extract_hierarchy_relationships, validate_hierarchy
+from ..utils.validation import (
+    HierarchyError, clean_organization_data, extract_hierarchy_relationships, validate_hierarchy_detailed
+)
+
+try:
+    import ijson
+except ImportError:  # Optional: only needed to stream very large structure files
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
+# Files larger than this are streamed with ijson (when installed) instead of json.load
+STREAMING_THRESHOLD_BYTES = 32 * 1024 * 1024
+
+# Nested structure keys and the organization level of their entries
+STRUCTURE_LEVELS = {
+    'departments': 'department',
+    'sub_departments': 'sub_department',
+    'units': 'unit',
+    'centres': 'centre',
+    'groups': 'group'
+}
+
+# Node keys read when building organization dictionaries
+_NODE_VALUE_KEYS = frozenset({'id', 'name', 'level', 'path'})
+
+# Validates a whole list of organizations in a single call
+_ORG_LIST_ADAPTER = TypeAdapter(List[OrganizationCreate])
+
 
 class ChalmersTransformer:
     """Transform Chalmers organizational structure with proper validation."""
@@ -44,9 +73,9 @@ class ChalmersTransformer:
         hierarchy_relationships = extract_hierarchy_relationships(raw_organizations)
         
         # 5. Validate complete hierarchy
-        is_valid, errors = validate_hierarchy(hierarchy_relationships)
+        is_valid, errors = validate_hierarchy_detailed(hierarchy_relationships)
         if not is_valid:
-            logger.warning(f"Hierarchy validation issues: {errors}")
+            logger.warning(f"Hierarchy validation issues: {[error.detail for error in errors]}")
             # Filter out problematic relationships
             hierarchy_relationships = self._fix_hierarchy_issues(hierarchy_relationships, errors)
         
@@ -59,38 +88,129 @@ class ChalmersTransformer:
         return validated_organizations, hierarchy_relationships
     
     def _load_json_file(self, file_path: str) -> Dict:
-        """Load JSON file with error handling."""
+        """Load JSON file with error handling.
+        
+        Large files are streamed when ijson is available, keeping only the keys
+        needed to extract organizations.
+        """
         file_path = Path(file_path)
         
         if not file_path.exists():
             raise FileNotFoundError(f"Chalmers structure file not found: {file_path}")
         
+        file_size = file_path.stat().st_size
+        
         try:
+            if ijson is not None and file_size > STREAMING_THRESHOLD_BYTES:
+                data = self._stream_structure_skeleton(file_path)
+                logger.info(f"Streamed JSON file: {file_path.name} ({file_size / 1024:.1f} KB)")
+                return data
+            
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            logger.info(f"Loaded JSON file: {file_path.name} ({file_path.stat().st_size / 1024:.1f} KB)")
+            logger.info(f"Loaded JSON file: {file_path.name} ({file_size / 1024:.1f} KB)")
             return data
             
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in Chalmers structure file: {e}")
         except Exception as e:
+            if ijson is not None and isinstance(e, ijson.JSONError):
+                raise ValueError(f"Invalid JSON in Chalmers structure file: {e}")
             raise Exception(f"Failed to load Chalmers structure file: {e}")
     
+    def _stream_structure_skeleton(self, file_path: Path) -> Dict:
+        """Stream the structure file into a pruned tree for nested extraction.
+        
+        Only the keys read by _extract_organizations_from_nested_structure are
+        materialized; every other subtree is skipped while parsing.
+        """
+        root: Dict = {}
+        stack: List[Tuple[object, str]] = []  # (container, mode)
+        key: Optional[str] = None
+        skip_depth = 0
+        
+        def child_mode(is_map: bool) -> Optional[str]:
+            """Decide how the value at the current position is kept (None = skip)."""
+            if not stack:
+                return 'top' if is_map else None
+            parent, mode = stack[-1]
+            if mode == 'full':
+                return 'full'
+            if mode in ('container', 'org_list'):
+                return 'node' if is_map else None
+            # 'top' or 'node'
+            if mode == 'top' and key == 'chalmers_organizational_structure':
+                return 'node' if is_map else None
+            if key in _NODE_VALUE_KEYS:
+                return 'full'
+            if key in STRUCTURE_LEVELS:
+                return 'container' if is_map else None
+            if key == 'organizations':
+                return 'org_list' if not is_map else None
+            return None
+        
+        def attach(value) -> None:
+            parent, _ = stack[-1]
+            if isinstance(parent, list):
+                parent.append(value)
+            else:
+                parent[key] = value
+        
+        with open(file_path, 'rb') as f:
+            for _, event, value in ijson.parse(f, use_float=True):
+                if skip_depth:
+                    if event in ('start_map', 'start_array'):
+                        skip_depth += 1
+                    elif event in ('end_map', 'end_array'):
+                        skip_depth -= 1
+                    continue
+                
+                if event == 'map_key':
+                    key = value
+                elif event in ('start_map', 'start_array'):
+                    mode = child_mode(event == 'start_map')
+                    if mode is None:
+                        skip_depth = 1
+                        continue
+                    container = {} if event == 'start_map' else []
+                    if stack:
+                        attach(container)
+                    else:
+                        root = container
+                    stack.append((container, mode))
+                elif event in ('end_map', 'end_array'):
+                    stack.pop()
+                elif stack and child_mode(False) == 'full':
+                    attach(value)
+        
+        return root
+    
     def _extract_organizations_from_nested_structure(self, data: Dict) -> List[Dict]:
         """Extract all organizations from the nested Chalmers structure."""
         organizations = []
         
         def process_organization_node(node: Dict, parent_id: Optional[str] = None, level: str = "unknown"):
-            """Recursively process organization nodes."""
+            """Recursively process organization nodes.
+            
+            A node repeating its parent's ID (the structure file lists some
+            organizations inside their own organizations array) is not emitted
+            again, but its children are still processed under that ID.
+            """
             if not isinstance(node, dict):
                 return
             
             # Check if this node represents an organization (has an ID)
-            if 'id' in node:
+            if 'id' in node and str(node['id']) == parent_id:
+                logger.debug(f"Organization {parent_id} repeats beneath itself in nested structure, "
+                             f"processing its children only")
+                current_id = parent_id
+            elif 'id' in node:
                 org = self._create_organization_dict(node, parent_id, level)
                 organizations.append(org)
-                current_id = node['id']
+                # Reuse the already-coerced string ID as the children's parent_id; a
+                # null/empty ID still means the children get no parent
+                current_id = org['id'] if node['id'] else None
             else:
                 current_id = parent_id
             
@@ -109,11 +229,16 @@ class ChalmersTransformer:
     
     def _create_organization_dict(self, node: Dict, parent_id: Optional[str], level: str) -> Dict:
         """Create organization dictionary from node data."""
+        # Levels repeat across nearly every node, so share one string per level
+        node_level = node.get('level', level)
+        if isinstance(node_level, str):
+            node_level = sys.intern(node_level)
+        
         org = {
             'id': str(node['id']),
             'nameEng': node.get('name', f"Organization {node['id']}"),
             'nameSwe': node.get('name', ''),  # Use same name if Swedish not available
-            'level': node.get('level', level),
+            'level': node_level,
             'organizationType': 'academic',
             'city': 'Gothenburg',
             'country': 'Sweden'
@@ -124,23 +249,15 @@ class ChalmersTransformer:
             org['displayPathEng'] = node['path']
             org['displayPathSwe'] = node['path']  # Assume same path for Swedish
         
-        # Add parent relationship info
+        # Add parent relationship info (parent_id is the parent's already-coerced string ID)
         if parent_id:
-            org['parent_id'] = str(parent_id)
+            org['parent_id'] = parent_id
         
         return org
     
     def _process_nested_structures(self, node: Dict, current_id: Optional[str], processor_func):
         """Process various nested organizational structures."""
-        structure_mappings = {
-            'departments': 'department',
-            'sub_departments': 'sub_department', 
-            'units': 'unit',
-            'centres': 'centre',
-            'groups': 'group'
-        }
-        
-        for key, level in structure_mappings.items():
+        for key, level in STRUCTURE_LEVELS.items():
             if key in node and isinstance(node[key], dict):
                 for item_key, item_value in node[key].items():
                     processor_func(item_value, current_id, level)
@@ -151,32 +268,18 @@ class ChalmersTransformer:
                 processor_func(org_item, current_id, 'unit')
     
     def _fix_hierarchy_issues(self, relationships: List[OrganizationHierarchy], 
-                             errors: List[str]) -> List[OrganizationHierarchy]:
+                             errors: List[HierarchyError]) -> List[OrganizationHierarchy]:
         """Fix hierarchy issues by removing problematic relationships."""
-        fixed_relationships = []
-        
-        # Remove self-referential relationships (critical fix)
-        self_refs = set()
-        for error in errors:
-            if "Self-reference detected" in error:
-                # Extract organization ID from error message
-                parts = error.split(" - ")
-                if len(parts) > 1:
-                    org_id = parts[1].split(" ")[0]
-                    self_refs.add(org_id)
+        # Remove self-referential relationships (critical fix), along with any
+        # relationship involving an organization flagged as self-referencing
+        self_refs = {error.org_id for error in errors if error.kind == 'self_reference'}
         
-        for rel in relationships:
-            # Skip self-referential relationships
-            if rel.childId == rel.parentId:
-                logger.warning(f"Removing self-referential relationship: {rel.childId} -> {rel.parentId}")
-                continue
-            
-            # Skip relationships involving organizations with self-reference issues
-            if rel.childId in self_refs or rel.parentId in self_refs:
-                logger.warning(f"Skipping relationship involving problematic org: {rel.childId} -> {rel.parentId}")
-                continue
-            
-            fixed_relationships.append(rel)
+        fixed_relationships = [
+            rel for rel in relationships
+            if rel.childId != rel.parentId
+            and rel.childId not in self_refs
+            and rel.parentId not in self_refs
+        ]
         
         logger.info(f"Fixed hierarchy: {len(fixed_relationships)} relationships "
                    f"(removed {len(relationships) - len(fixed_relationships)} problematic ones)")
@@ -185,6 +288,14 @@ class ChalmersTransformer:
     
     def _create_organization_models(self, organizations: List[Dict]) -> List[OrganizationCreate]:
         """Create validated organization models."""
+        try:
+            validated_organizations = _ORG_LIST_ADAPTER.validate_python(organizations)
+            logger.info(f"Created {len(validated_organizations)} validated organization models")
+            return validated_organizations
+        except ValidationError:
+            # Fall back to per-item validation to report and skip invalid organizations
+            pass
+        
         validated_organizations = []
         
         for org_data in organizations:
@@ -204,21 +315,19 @@ class ChalmersTransformer:
                                     relationships: List[OrganizationHierarchy]) -> Dict:
         """Get statistics about the organizational structure."""
         # Count organizations by level
-        level_counts = {}
-        for org in organizations:
-            level = org.level or 'unknown'
-            level_counts[level] = level_counts.get(level, 0) + 1
+        level_counts = dict(Counter(org.level or 'unknown' for org in organizations))
+        
+        # Index the hierarchy once and share it with the depth calculation
+        children_map, parent_counts = self._index_relationships(relationships)
         
         # Find root organizations (those that are never children)
-        child_ids = {rel.childId for rel in relationships}
-        parent_ids = {rel.parentId for rel in relationships}
-        root_ids = parent_ids - child_ids
+        root_ids = children_map.keys() - parent_counts.keys()
         
         # Find leaf organizations (those that are never parents)
-        leaf_ids = child_ids - parent_ids
+        leaf_ids = parent_counts.keys() - children_map.keys()
         
         # Calculate hierarchy depth
-        max_depth = self._calculate_max_hierarchy_depth(relationships)
+        max_depth = self._calculate_max_hierarchy_depth_from_index(children_map, parent_counts)
         
         return {
             'total_organizations': len(organizations),
@@ -231,39 +340,52 @@ class ChalmersTransformer:
             'validation_passed': True
         }
     
+    def _index_relationships(self, relationships: List[OrganizationHierarchy]
+                             ) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+        """Build the parent -> children map and per-child parent counts in one pass.
+        
+        The map's keys are the parent IDs and the counts' keys are the child IDs.
+        """
+        children_map: Dict[str, List[str]] = {}
+        parent_counts: Dict[str, int] = {}
+        
+        for rel in relationships:
+            children_map.setdefault(rel.parentId, []).append(rel.childId)
+            parent_counts[rel.childId] = parent_counts.get(rel.childId, 0) + 1
+        
+        return children_map, parent_counts
+    
     def _calculate_max_hierarchy_depth(self, relationships: List[OrganizationHierarchy]) -> int:
         """Calculate maximum hierarchy depth."""
         if not relationships:
             return 0
         
-        # Build parent-child mapping
-        children_map = {}
-        for rel in relationships:
-            if rel.parentId not in children_map:
-                children_map[rel.parentId] = []
-            children_map[rel.parentId].append(rel.childId)
-        
-        # Find root organizations
-        child_ids = {rel.childId for rel in relationships}
-        parent_ids = {rel.parentId for rel in relationships}
-        roots = parent_ids - child_ids
-        
-        # Calculate depth from each root
-        max_depth = 0
-        
-        def calculate_depth(org_id: str, current_depth: int = 0) -> int:
-            if org_id not in children_map:
-                return current_depth
-            
-            max_child_depth = current_depth
-            for child_id in children_map[org_id]:
-                child_depth = calculate_depth(child_id, current_depth + 1)
-                max_child_depth = max(max_child_depth, child_depth)
-            
-            return max_child_depth
+        return self._calculate_max_hierarchy_depth_from_index(*self._index_relationships(relationships))
+    
+    def _calculate_max_hierarchy_depth_from_index(self, children_map: Dict[str, List[str]],
+                                                  parent_counts: Dict[str, int]) -> int:
+        """Calculate maximum hierarchy depth from a pre-built relationship index."""
+        if not children_map:
+            return 0
         
-        for root_id in roots:
-            depth = calculate_depth(root_id)
-            max_depth = max(max_depth, depth)
+        # In-degree per organization (number of parent edges); roots have none
+        in_degree: Dict[str, int] = dict.fromkeys(children_map, 0)
+        in_degree.update(parent_counts)
+        
+        # Longest path via iterative topological order (Kahn), starting from roots.
+        # Nodes on a cycle never reach in-degree 0 and are ignored.
+        depth = {org_id: 0 for org_id in in_degree}
+        queue = deque(org_id for org_id, degree in in_degree.items() if degree == 0)
+        
+        while queue:
+            org_id = queue.popleft()
+            for child_id in children_map.get(org_id, ()):
+                if depth[org_id] + 1 > depth[child_id]:
+                    depth[child_id] = depth[org_id] + 1
+                in_degree[child_id] -= 1
+                if in_degree[child_id] == 0:
+                    queue.append(child_id)
+        
+        max_depth = max(depth.values())
         
         return max_depth
\ No newline at end of file
@@ -4,16 +4,118 @@ ES Data Transformer
 Transform Elasticsearch source documents to Neo4j format with clean architecture
 """
 
+import logging
+import sys
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
+from pydantic import TypeAdapter, ValidationError
 from ..models.person import PersonCreate
 from ..models.publication import PublicationCreate
 from ..models.organization import OrganizationCreate
 
+logger = logging.getLogger(__name__)
+
+# List adapters validate a whole batch of rows in a single call
+_PERSON_LIST_ADAPTER = TypeAdapter(List[PersonCreate])
+_PUBLICATION_LIST_ADAPTER = TypeAdapter(List[PublicationCreate])
+_ORGANIZATION_LIST_ADAPTER = TypeAdapter(List[OrganizationCreate])
+
+
+# Fixed-layout carriers for extracted fields, validated by Pydantic from attributes.
+# Missing optional values are None, which the models treat the same as absent.
+@dataclass(slots=True)
+class _PersonRow:
+    id: str
+    displayName: str
+    firstName: Optional[str] = None
+    lastName: Optional[str] = None
+    birthYear: Optional[int] = None
+    email: Optional[str] = None
+    orcid: Optional[str] = None
+    scopusAuthorId: Optional[str] = None
+    cid: Optional[str] = None
+
+
+@dataclass(slots=True)
+class _PublicationRow:
+    id: str
+    title: str
+    year: int
+    publicationType: str
+    text: str
+    abstract: Optional[str] = None
+    language: Optional[str] = None
+    doi: Optional[str] = None
+    scopusId: Optional[str] = None
+    pubmedId: Optional[str] = None
+    isbn: Optional[str] = None
+    journalTitle: Optional[str] = None
+    journalPublisher: Optional[str] = None
+    detailsUrlEng: Optional[str] = None
+
+
+@dataclass(slots=True)
+class _OrganizationRow:
+    id: str
+    nameEng: str
+    organizationType: str
+    nameSwe: Optional[str] = None
+    displayNameEng: Optional[str] = None
+    displayPathEng: Optional[str] = None
+    level: Optional[str] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+    geoLat: Optional[float] = None
+    geoLong: Optional[float] = None
+
+
+# Organization level by ES Level number; the last entry covers deeper levels
+_LEVEL_TABLE = ('university', 'department', 'unit')
+
+# (substring of OrganizationTypes NameEng, organization type), first match wins
+_ORGANIZATION_TYPE_RULES = (
+    ('research', 'research_institute'),
+    ('admin', 'administrative'),
+)
+
+# Supported language codes, mapped to one shared instance per code
+_LANGUAGE_CODES = {code: code for code in ('en', 'sv', 'de', 'fr', 'es')}
+
+
+def _intern_stripped(value: str) -> Optional[str]:
+    """Strip a low-cardinality string field and intern it, or None when empty
+    
+    Values like City and Country repeat across most documents, so interning
+    keeps one instance per distinct value in bulk-transformed rows.
+    """
+    value = value.strip()
+    return sys.intern(value) if value else None
+
+
+def _coerce_birth_year(birth_year: Any) -> Optional[int]:
+    """Coerce a BirthYear value to int, or None when it is not numeric"""
+    if birth_year and not isinstance(birth_year, int):
+        try:
+            return int(birth_year)
+        except (ValueError, TypeError):
+            return None
+    return birth_year
+
+
+def _first_as_str(values: Any) -> Optional[str]:
+    """First element of a non-empty list as a string, otherwise None"""
+    if values and isinstance(values, list):
+        return str(values[0])
+    return None
+
 
 class ESTransformer:
     """Transform real ES source documents to validated Neo4j node format"""
     
+    # Identifier type codes picked up from the person Identifiers array
+    _INTERESTING_ID_TYPES = frozenset({'RESEARCHER_ID'})
+    
     @staticmethod
     def transform_person(es_doc: Dict, es_id: str = None) -> PersonCreate:
         """Transform person document from real ES _source format
@@ -25,6 +127,27 @@ class ESTransformer:
         Returns:
             Validated PersonCreate instance
         """
+        return PersonCreate.model_validate(ESTransformer._extract_person_data(es_doc, es_id), from_attributes=True)
+    
+    @staticmethod
+    def transform_persons_bulk(docs: List[Dict]) -> List[PersonCreate]:
+        """Transform a batch of person documents, validating all rows at once
+        
+        Documents that fail extraction or validation are skipped.
+        
+        Args:
+            docs: List of ES person document _source data
+            
+        Returns:
+            List of validated PersonCreate instances
+        """
+        return ESTransformer._transform_bulk(
+            docs, ESTransformer._extract_person_data, _PERSON_LIST_ADAPTER, PersonCreate, 'person'
+        )
+    
+    @staticmethod
+    def _extract_person_data(es_doc: Dict, es_id: str = None) -> _PersonRow:
+        """Extract PersonCreate fields from an ES person document"""
         
         # Extract ES ID - use provided es_id or Id field from _source
         doc_id = es_id or es_doc.get('Id') or es_doc.get('_es_id')
@@ -41,64 +164,45 @@ class ESTransformer:
         last_name = es_doc.get('LastName', '').strip()
         
         # Birth year with validation
-        birth_year = es_doc.get('BirthYear')
-        if birth_year and not isinstance(birth_year, int):
-            try:
-                birth_year = int(birth_year)
-            except (ValueError, TypeError):
-                birth_year = None
+        birth_year = _coerce_birth_year(es_doc.get('BirthYear'))
         
         # Email extraction (optional)
         email = None  # ES docs typically don't have email in current format
         
         # ORCID extraction and normalization
-        orcid = None
-        orcid_list = es_doc.get('IdentifierOrcid', [])
-        if orcid_list and isinstance(orcid_list, list):
-            orcid = str(orcid_list[0]).strip()
-        
-        # Scopus Author ID
-        scopus_author_id = None
-        # Extract from complex Identifiers array
-        identifiers = es_doc.get('Identifiers', [])
-        for identifier in identifiers:
-            if isinstance(identifier, dict) and identifier.get('IsActive', True):
-                id_type = identifier.get('Type', {})
-                if isinstance(id_type, dict):
-                    type_value = id_type.get('Value', '')
-                    if type_value == 'RESEARCHER_ID':
-                        scopus_author_id = identifier.get('Value', '')
-                        break
+        orcid = (_first_as_str(es_doc.get('IdentifierOrcid')) or '').strip()
+        
+        # Scopus Author ID from complex Identifiers array
+        scopus_author_id = ESTransformer._find_researcher_id(es_doc.get('Identifiers', ()))
         
         # Institutional ID (CID)
-        cid = None
-        cpl_ids = es_doc.get('IdentifierCplPersonId', [])
-        if cpl_ids and isinstance(cpl_ids, list):
-            cid = str(cpl_ids[0])
+        cid = _first_as_str(es_doc.get('IdentifierCplPersonId'))
         
         # Create validated person
-        person_data = {
-            'id': str(doc_id),
-            'displayName': display_name
-        }
-        
-        # Add optional fields only if they have values
-        if first_name:
-            person_data['firstName'] = first_name
-        if last_name:
-            person_data['lastName'] = last_name
-        if birth_year:
-            person_data['birthYear'] = birth_year
-        if email:
-            person_data['email'] = email
-        if orcid:
-            person_data['orcid'] = orcid
-        if scopus_author_id:
-            person_data['scopusAuthorId'] = scopus_author_id
-        if cid:
-            person_data['cid'] = cid
-        
-        return PersonCreate(**person_data)
+        return _PersonRow(
+            id=str(doc_id),
+            displayName=display_name,
+            firstName=first_name or None,
+            lastName=last_name or None,
+            birthYear=birth_year or None,
+            email=email or None,
+            orcid=orcid or None,
+            scopusAuthorId=scopus_author_id or None,
+            cid=cid or None
+        )
+    
+    @staticmethod
+    def _find_researcher_id(identifiers: Any) -> Optional[str]:
+        """Value of the first active identifier with an interesting type code"""
+        interesting_types = ESTransformer._INTERESTING_ID_TYPES
+        for identifier in identifiers:
+            if type(identifier) is not dict:
+                continue
+            id_type = identifier.get('Type')
+            type_value = id_type.get('Value') if type(id_type) is dict else None
+            if type_value in interesting_types and identifier.get('IsActive', True):
+                return identifier.get('Value', '')
+        return None
     
     @staticmethod
     def transform_publication(es_doc: Dict, es_id: str = None) -> PublicationCreate:
@@ -111,6 +215,27 @@ class ESTransformer:
         Returns:
             Validated PublicationCreate instance
         """
+        return PublicationCreate.model_validate(ESTransformer._extract_publication_data(es_doc, es_id), from_attributes=True)
+    
+    @staticmethod
+    def transform_publications_bulk(docs: List[Dict]) -> List[PublicationCreate]:
+        """Transform a batch of publication documents, validating all rows at once
+        
+        Documents that fail extraction or validation are skipped.
+        
+        Args:
+            docs: List of ES publication document _source data
+            
+        Returns:
+            List of validated PublicationCreate instances
+        """
+        return ESTransformer._transform_bulk(
+            docs, ESTransformer._extract_publication_data, _PUBLICATION_LIST_ADAPTER, PublicationCreate, 'publication'
+        )
+    
+    @staticmethod
+    def _extract_publication_data(es_doc: Dict, es_id: str = None) -> _PublicationRow:
+        """Extract PublicationCreate fields from an ES publication document"""
         
         # Extract ES ID
         doc_id = es_id or es_doc.get('Id') or es_doc.get('_es_id')
@@ -156,9 +281,7 @@ class ESTransformer:
         language = 'en'  # default
         lang_obj = es_doc.get('Language', {})
         if isinstance(lang_obj, dict):
-            iso = lang_obj.get('Iso', '').lower()
-            if iso in ['en', 'sv', 'de', 'fr', 'es']:
-                language = iso
+            language = _LANGUAGE_CODES.get(lang_obj.get('Iso', '').lower(), language)
         
         # DOI extraction
         doi = None
@@ -207,9 +330,9 @@ class ESTransformer:
         if isinstance(keywords, list):
             keyword_strings = []
             for kw in keywords:
-                if isinstance(kw, str):
+                if type(kw) is str:
                     keyword_strings.append(kw)
-                elif isinstance(kw, dict) and 'Value' in kw:
+                elif type(kw) is dict and 'Value' in kw:
                     keyword_strings.append(str(kw['Value']))
             if keyword_strings:
                 text_parts.append(' '.join(keyword_strings))
@@ -217,35 +340,22 @@ class ESTransformer:
         text = ' '.join(text_parts)
         
         # Create validated publication
-        pub_data = {
-            'id': str(doc_id),
-            'title': title,
-            'year': year,
-            'publicationType': publication_type,
-            'text': text
-        }
-        
-        # Add optional fields only if they have values
-        if abstract:
-            pub_data['abstract'] = abstract
-        if language:
-            pub_data['language'] = language
-        if doi:
-            pub_data['doi'] = doi
-        if scopus_id:
-            pub_data['scopusId'] = scopus_id
-        if pubmed_id:
-            pub_data['pubmedId'] = pubmed_id
-        if isbn:
-            pub_data['isbn'] = isbn
-        if journal_title:
-            pub_data['journalTitle'] = journal_title
-        if journal_publisher:
-            pub_data['journalPublisher'] = journal_publisher
-        if details_url_eng:
-            pub_data['detailsUrlEng'] = details_url_eng
-        
-        return PublicationCreate(**pub_data)
+        return _PublicationRow(
+            id=str(doc_id),
+            title=title,
+            year=year,
+            publicationType=publication_type,
+            text=text,
+            abstract=abstract or None,
+            language=language or None,
+            doi=doi or None,
+            scopusId=scopus_id or None,
+            pubmedId=pubmed_id or None,
+            isbn=isbn or None,
+            journalTitle=journal_title or None,
+            journalPublisher=journal_publisher or None,
+            detailsUrlEng=details_url_eng or None
+        )
     
     @staticmethod
     def transform_organization(es_doc: Dict, es_id: str = None) -> OrganizationCreate:
@@ -258,6 +368,27 @@ class ESTransformer:
         Returns:
             Validated OrganizationCreate instance
         """
+        return OrganizationCreate.model_validate(ESTransformer._extract_organization_data(es_doc, es_id), from_attributes=True)
+    
+    @staticmethod
+    def transform_organizations_bulk(docs: List[Dict]) -> List[OrganizationCreate]:
+        """Transform a batch of organization documents, validating all rows at once
+        
+        Documents that fail extraction or validation are skipped.
+        
+        Args:
+            docs: List of ES organization document _source data
+            
+        Returns:
+            List of validated OrganizationCreate instances
+        """
+        return ESTransformer._transform_bulk(
+            docs, ESTransformer._extract_organization_data, _ORGANIZATION_LIST_ADAPTER, OrganizationCreate, 'organization'
+        )
+    
+    @staticmethod
+    def _extract_organization_data(es_doc: Dict, es_id: str = None) -> _OrganizationRow:
+        """Extract OrganizationCreate fields from an ES organization document"""
         
         # Extract ES ID
         doc_id = es_id or es_doc.get('Id') or es_doc.get('_es_id')
@@ -275,32 +406,29 @@ class ESTransformer:
         display_name_eng = es_doc.get('DisplayNameEng', '').strip() or None
         display_path_eng = es_doc.get('DisplayPathEng', '').strip() or None
         
-        # Level mapping
-        level = 'department'  # default
+        # Level mapping (levels beyond the table are units; non-numeric or
+        # negative levels default to department)
         level_num = es_doc.get('Level', 0)
-        if isinstance(level_num, int):
-            if level_num == 0:
-                level = 'university'
-            elif level_num == 1:
-                level = 'department'
-            elif level_num >= 2:
-                level = 'unit'
+        if isinstance(level_num, int) and level_num >= 0:
+            level = _LEVEL_TABLE[min(level_num, len(_LEVEL_TABLE) - 1)]
+        else:
+            level = 'department'
         
         # Organization type
         organization_type = 'academic'  # default
         org_types = es_doc.get('OrganizationTypes', [])
-        if isinstance(org_types, list) and org_types:
+        if type(org_types) is list and org_types:
             type_obj = org_types[0]
-            if isinstance(type_obj, dict):
+            if type(type_obj) is dict:
                 type_name = type_obj.get('NameEng', '').lower()
-                if 'research' in type_name:
-                    organization_type = 'research_institute'
-                elif 'admin' in type_name:
-                    organization_type = 'administrative'
+                organization_type = next(
+                    (org_type for marker, org_type in _ORGANIZATION_TYPE_RULES if marker in type_name),
+                    organization_type
+                )
         
         # Geographic data
-        city = es_doc.get('City', '').strip() or None
-        country = es_doc.get('Country', '').strip() or None
+        city = _intern_stripped(es_doc.get('City', ''))
+        country = _intern_stripped(es_doc.get('Country', ''))
         
         geo_lat = None
         geo_long = None
@@ -316,85 +444,106 @@ class ESTransformer:
                 pass
         
         # Create validated organization
-        org_data = {
-            'id': str(doc_id),
-            'nameEng': name_eng
-        }
-        
-        # Add optional fields only if they have values
-        if name_swe:
-            org_data['nameSwe'] = name_swe
-        if display_name_eng:
-            org_data['displayNameEng'] = display_name_eng
-        if display_path_eng:
-            org_data['displayPathEng'] = display_path_eng
-        if level:
-            org_data['level'] = level
-        if organization_type:
-            org_data['organizationType'] = organization_type
-        if city:
-            org_data['city'] = city
-        if country:
-            org_data['country'] = country
-        if geo_lat is not None:
-            org_data['geoLat'] = geo_lat
-        if geo_long is not None:
-            org_data['geoLong'] = geo_long
-        
-        return OrganizationCreate(**org_data)
+        return _OrganizationRow(
+            id=str(doc_id),
+            nameEng=name_eng,
+            organizationType=organization_type,
+            nameSwe=name_swe or None,
+            displayNameEng=display_name_eng or None,
+            displayPathEng=display_path_eng or None,
+            level=level or None,
+            city=city or None,
+            country=country or None,
+            geoLat=geo_lat,
+            geoLong=geo_long
+        )
+    
+    @staticmethod
+    def _transform_bulk(docs: List[Dict], extract: Callable[[Dict], Any],
+                        adapter: TypeAdapter, model: type, doc_type: str) -> List[Any]:
+        """Extract rows for a batch of documents and validate them in one pass
+        
+        Falls back to per-row validation when the batch contains invalid rows,
+        so a single bad document does not discard the whole batch.
+        """
+        rows = []
+        for index, doc in enumerate(docs):
+            try:
+                rows.append(extract(doc))
+            except (ValueError, TypeError, AttributeError) as e:
+                # Log by position: a malformed element may not be a dict at all
+                logger.warning(f"Skipping {doc_type} document at index {index}: {e}")
+        
+        try:
+            return adapter.validate_python(rows, from_attributes=True)
+        except ValidationError:
+            pass
+        
+        validated = []
+        for row in rows:
+            try:
+                validated.append(model.model_validate(row, from_attributes=True))
+            except ValidationError as e:
+                logger.warning(f"Skipping invalid {doc_type} {row.id}: {e}")
+        return validated
 
 
 class ESRelationshipExtractor:
     """Extract relationships from ES source documents with validation"""
     
     @staticmethod
-    def extract_authorship_relationships(publications: List[Dict]) -> List[Dict]:
+    def extract_authorship_relationships(publications: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
         """Extract AUTHORED relationships from publication documents
         
         Args:
             publications: List of ES publication documents
+            now: Timestamp stamped on every relationship (defaults to current time)
             
         Returns:
             List of authorship relationship dictionaries
         """
         relationships = []
+        now = now or datetime.now()
         
         for pub in publications:
             pub_source = pub.get('_source', pub)  # Handle both ES format and direct source
             pub_es_id = pub.get('_id') or pub_source.get('Id') or pub_source.get('_es_id')
-            
-            if not pub_es_id:
-                continue
-            
-            # Extract persons from the Persons array
-            persons = pub_source.get('Persons', [])
-            for i, person_data in enumerate(persons):
-                if isinstance(person_data, dict):
-                    person_ref = person_data.get('PersonData', {})
-                    person_id = person_ref.get('Id')
-                    
-                    if person_id:
-                        relationships.append({
-                            'sourceId': str(person_id),
-                            'targetId': str(pub_es_id),
-                            'order': i,  # 0-based ordering
-                            'role': 'Author',
-                            'createdAt': datetime.now()
-                        })
+            if pub_es_id:
+                ESRelationshipExtractor._append_authorships(relationships, pub_source, pub_es_id, now)
         
         return relationships
     
     @staticmethod
-    def extract_affiliation_relationships(persons: List[Dict]) -> List[Dict]:
+    def _append_authorships(relationships: List[Dict], pub_source: Dict, pub_es_id: Any, now: datetime) -> None:
+        """Append AUTHORED relationships for the Persons array of one publication"""
+        target_id = str(pub_es_id)
+        for i, person_data in enumerate(pub_source.get('Persons', [])):
+            if type(person_data) is dict:
+                person_id = person_data.get('PersonData', {}).get('Id')
+                
+                if person_id:
+                    relationships.append({
+                        'sourceId': str(person_id),
+                        'targetId': target_id,
+                        'order': i,  # 0-based ordering
+                        'role': 'Author',
+                        'createdAt': now
+                    })
+    
+    @staticmethod
+    def extract_affiliation_relationships(persons: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
         """Extract AFFILIATED_WITH relationships from person documents
         
         Args:
             persons: List of ES person documents
+            now: Timestamp stamped on every relationship (defaults to current time)
             
         Returns:
-            List of affiliation relationship dictionaries
+            List of affiliation relationship dictionaries, without exact duplicates
         """
         relationships = []
+        seen: Set[Tuple] = set()
+        now = now or datetime.now()
         
         for person in persons:
             person_source = person.get('_source', person)  # Handle both ES format and direct source
@@ -406,16 +555,24 @@ class ESRelationshipExtractor:
             # Extract organization home affiliations
             org_home_list = person_source.get('OrganizationHome', [])
             for org_home in org_home_list:
-                if isinstance(org_home, dict):
+                if type(org_home) is dict:
                     org_data = org_home.get('OrganizationData', {})
                     org_id = org_data.get('Id')
                     
                     if org_id:
+                        # The same person often appears in many documents and lists
+                        # the same affiliation more than once; emit each row once
+                        key = (person_es_id, org_id, org_home.get('StartDate'), org_home.get('EndDate'),
+                               org_home.get('TitleEng'), org_home.get('Priority'))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        
                         # Create relationship with metadata
                         rel_data = {
                             'sourceId': str(person_es_id),
                             'targetId': str(org_id),
-                            'createdAt': datetime.now()
+                            'createdAt': now
                         }
                         
                         # Add optional metadata
@@ -433,16 +590,19 @@ class ESRelationshipExtractor:
         return relationships
     
     @staticmethod
-    def extract_organization_hierarchy(organizations: List[Dict]) -> List[Dict]:
+    def extract_organization_hierarchy(organizations: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
         """Extract PART_OF relationships from organization documents
         
         Args:
             organizations: List of ES organization documents
+            now: Timestamp stamped on every relationship (defaults to current time)
             
         Returns:
-            List of hierarchy relationship dictionaries
+            List of hierarchy relationship dictionaries, without exact duplicates
         """
         relationships = []
+        seen: Set[Tuple] = set()
+        now = now or datetime.now()
         
         for org in organizations:
             org_source = org.get('_source', org)  # Handle both ES format and direct source
@@ -454,14 +614,19 @@ class ESRelationshipExtractor:
             # Extract parent organization relationships
             org_parents = org_source.get('OrganizationParents', [])
             for parent_ref in org_parents:
-                if isinstance(parent_ref, dict):
+                if type(parent_ref) is dict:
                     parent_id = parent_ref.get('ParentOrganizationId')
                     
                     if parent_id and parent_id != org_es_id:  # Prevent self-references
+                        key = (org_es_id, parent_id, parent_ref.get('FromDate'), parent_ref.get('ToDate'))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        
                         rel_data = {
                             'childId': str(org_es_id),
                             'parentId': str(parent_id),
-                            'createdAt': datetime.now()
+                            'createdAt': now
                         }
                         
                         # Add optional temporal data
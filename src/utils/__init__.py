@@ -2,6 +2,12 @@
 Utilities for data validation and relationship integrity checks.
 """
 
-from .validation import validate_hierarchy, prevent_cycles, validate_relationship
+from .validation import (
+    HierarchyError, HierarchyValidator, validate_hierarchy, validate_hierarchy_detailed, prevent_cycles,
+    validate_relationship
+)
 
-__all__ = ['validate_hierarchy', 'prevent_cycles', 'validate_relationship']
\ No newline at end of file
+__all__ = [
+    'HierarchyError', 'HierarchyValidator', 'validate_hierarchy', 'validate_hierarchy_detailed',
+    'prevent_cycles', 'validate_relationship'
+]
\ No newline at end of file
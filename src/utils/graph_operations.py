@@ -4,26 +4,197 @@ Graph Operations Utilities
 Utility functions for selective graph operations, verification, and maintenance
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+import atexit
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple, Union
 from datetime import datetime
+from neo4j.exceptions import ClientError
 from ..core.config import Config
 from ..core.neo4j_client import Neo4jClient, get_neo4j_client
 
+logger = logging.getLogger(__name__)
+
+
+def _build_count_query(queries: Dict[str, str]) -> str:
+    """Combine count queries into one UNION ALL query returning (key, count) rows
+    
+    Args:
+        queries: Mapping of result key to a query returning one `count` column
+        
+    Returns:
+        Combined Cypher query
+    """
+    return "\nUNION ALL\n".join(
+        f"CALL {{ {query.strip()} }} RETURN '{key}' AS key, count"
+        for key, query in queries.items()
+    )
+
 
 class GraphOperations:
     """Comprehensive graph operations and utilities"""
     
-    def __init__(self, neo4j_client: Optional[Neo4jClient] = None):
+    # Independent read queries are spread over this many worker threads; each
+    # execute_query call opens its own session from the driver's connection pool
+    MAX_QUERY_WORKERS = 8
+    
+    # Results of read-only count/statistics queries are reused for this long,
+    # unless a clear through this instance invalidates them first
+    QUERY_CACHE_TTL_SECONDS = 60
+    QUERY_CACHE_MAX_ENTRIES = 128
+    
+    # Deletes are committed in batches of this many rows so large clears do not
+    # have to hold the whole change set in server memory
+    DELETE_BATCH_SIZE = 10000
+    
+    # Labels and relationship types cannot be Cypher parameters, so queries that
+    # need one are built from these templates once per label and then reused;
+    # everything else (e.g. LIMIT) is passed as a parameter
+    LABEL_QUERY_TEMPLATES = {
+        'delete_relationships': "MATCH ()-[r:{label}]->() CALL {{ WITH r DELETE r }} IN TRANSACTIONS OF {batch_size} ROWS",
+        'delete_nodes': "MATCH (n:{label}) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {batch_size} ROWS",
+        'export_nodes': "MATCH (n:{label}) RETURN n",
+        'export_nodes_limited': "MATCH (n:{label}) RETURN n LIMIT $limit"
+    }
+    LABEL_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+    
+    # Hierarchy edges, analysed in Python for cycles and depth; walking
+    # variable-length PART_OF paths in Cypher explodes combinatorially
+    PART_OF_EDGES_QUERY = """
+    MATCH (child:Organization)-[:PART_OF]->(parent:Organization)
+    RETURN child.id as child_id, parent.id as parent_id
+    """
+    
+    NODE_COUNT_QUERIES = {
+        'organizations': "MATCH (n:Organization) RETURN count(n) as count",
+        'persons': "MATCH (n:Person) RETURN count(n) as count",
+        'publications': "MATCH (n:Publication) RETURN count(n) as count",
+        'keywords': "MATCH (n:Keyword) RETURN count(n) as count"
+    }
+    
+    RELATIONSHIP_COUNT_QUERIES = {
+        'part_of': "MATCH ()-[r:PART_OF]->() RETURN count(r) as count",
+        'affiliated_with': "MATCH ()-[r:AFFILIATED_WITH]->() RETURN count(r) as count",
+        'authored': "MATCH ()-[r:AUTHORED]->() RETURN count(r) as count",
+        'has_keyword': "MATCH ()-[r:HAS_KEYWORD]->() RETURN count(r) as count"
+    }
+    
+    # Self-reference, orphan and data quality counts for verify_graph_integrity,
+    # scanning each label once
+    INTEGRITY_CHECKS_QUERY = """
+    CALL {
+        MATCH (child:Organization)-[r:PART_OF]->(parent:Organization)
+        WHERE child.id = parent.id
+        RETURN count(r) as self_referential_part_of
+    }
+    CALL {
+        MATCH (p:Person)
+        RETURN
+            count(CASE WHEN NOT EXISTS { MATCH (p)-[:AUTHORED]->() }
+                AND NOT EXISTS { MATCH (p)-[:AFFILIATED_WITH]->() } THEN 1 END) as orphaned_persons,
+            count(CASE WHEN p.displayName IS NULL OR p.displayName = '' THEN 1 END) as persons_without_display_name
+    }
+    CALL {
+        MATCH (pub:Publication)
+        RETURN
+            count(CASE WHEN NOT EXISTS { MATCH ()-[:AUTHORED]->(pub) }
+                AND NOT EXISTS { MATCH (pub)-[:HAS_KEYWORD]->() } THEN 1 END) as orphaned_publications,
+            count(CASE WHEN pub.title IS NULL OR pub.title = '' THEN 1 END) as publications_without_title
+    }
+    CALL {
+        MATCH (o:Organization)
+        RETURN
+            count(CASE WHEN NOT EXISTS { MATCH (o)-[:PART_OF]->() }
+                AND NOT EXISTS { MATCH ()-[:PART_OF]->(o) }
+                AND NOT EXISTS { MATCH ()-[:AFFILIATED_WITH]->(o) } THEN 1 END) as orphaned_organizations,
+            count(CASE WHEN o.nameEng IS NULL OR o.nameEng = '' THEN 1 END) as organizations_without_name
+    }
+    RETURN *
+    """
+    
+    # Independent statistics queries, run concurrently by get_graph_statistics
+    STATISTICS_QUERIES = {
+        # Root (no parents) and leaf (no children) organizations, from one scan
+        'hierarchy': """
+        MATCH (o:Organization)
+        RETURN
+            count(CASE WHEN NOT EXISTS { MATCH (o)-[:PART_OF]->() } THEN 1 END) as root_count,
+            count(CASE WHEN NOT EXISTS { MATCH ()-[:PART_OF]->(o) } THEN 1 END) as leaf_count
+        """,
+        
+        # Publications per year distribution
+        'year_dist': """
+        MATCH (pub:Publication)
+        WHERE pub.year IS NOT NULL
+        RETURN pub.year as year, count(pub) as count
+        ORDER BY year DESC
+        LIMIT 10
+        """,
+        
+        # Authors per publication statistics
+        'author_stats': """
+        MATCH (pub:Publication)
+        OPTIONAL MATCH (p:Person)-[:AUTHORED]->(pub)
+        WITH pub, count(p) as author_count
+        RETURN 
+            min(author_count) as min_authors,
+            max(author_count) as max_authors,
+            avg(author_count) as avg_authors
+        """,
+        
+        # Persons with ORCID and active affiliations, from one Person scan
+        'person': """
+        MATCH (p:Person)
+        OPTIONAL MATCH (p)-[r:AFFILIATED_WITH]->()
+        WHERE r.endDate IS NULL
+        RETURN
+            count(DISTINCT CASE WHEN p.orcid IS NOT NULL THEN p END) as orcid_count,
+            count(r) as active_affiliations
+        """
+    }
+    
+    # Every fixed read query issued by the methods above, planned up front when
+    # the instance is created with warmup=True
+    CANONICAL_QUERIES = [
+        _build_count_query(NODE_COUNT_QUERIES),
+        _build_count_query(RELATIONSHIP_COUNT_QUERIES),
+        INTEGRITY_CHECKS_QUERY,
+        PART_OF_EDGES_QUERY,
+        *STATISTICS_QUERIES.values()
+    ]
+    
+    def __init__(self, neo4j_client: Optional[Neo4jClient] = None, warmup: bool = False):
         """Initialize graph operations
         
         Args:
             neo4j_client: Optional Neo4j client instance
+            warmup: Plan the canonical queries up front so first calls hit the plan cache
         """
         if neo4j_client:
             self.client = neo4j_client
         else:
             config = Config()
             self.client = get_neo4j_client(config)
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_QUERY_WORKERS)
+        self._query_cache: Dict[Tuple[str, Tuple], Tuple[float, List[Dict]]] = {}
+        self._query_cache_lock = threading.Lock()
+        self._compiled: Dict[Tuple[str, str], str] = {}
+        
+        if warmup:
+            self.warm_up_query_plans()
+    
+    def warm_up_query_plans(self):
+        """Load the canonical queries into Neo4j's plan cache without running them"""
+        for query in self.CANONICAL_QUERIES:
+            try:
+                self.client.execute_query(f"EXPLAIN {query}")
+            except Exception as e:
+                logger.warning(f"Could not warm up query plan: {e}")
     
     def get_node_counts(self) -> Dict[str, int]:
         """Get counts of all node types in the graph
@@ -31,19 +202,7 @@ class GraphOperations:
         Returns:
             Dictionary with node type counts
         """
-        queries = {
-            'organizations': "MATCH (n:Organization) RETURN count(n) as count",
-            'persons': "MATCH (n:Person) RETURN count(n) as count",
-            'publications': "MATCH (n:Publication) RETURN count(n) as count",
-            'keywords': "MATCH (n:Keyword) RETURN count(n) as count"
-        }
-        
-        counts = {}
-        for node_type, query in queries.items():
-            result = self.client.execute_query(query)
-            counts[node_type] = result[0]['count'] if result else 0
-        
-        return counts
+        return self._execute_counts(self.NODE_COUNT_QUERIES, use_cache=True)
     
     def get_relationship_counts(self) -> Dict[str, int]:
         """Get counts of all relationship types in the graph
@@ -51,218 +210,298 @@ class GraphOperations:
         Returns:
             Dictionary with relationship type counts
         """
-        queries = {
-            'part_of': "MATCH ()-[r:PART_OF]->() RETURN count(r) as count",
-            'affiliated_with': "MATCH ()-[r:AFFILIATED_WITH]->() RETURN count(r) as count",
-            'authored': "MATCH ()-[r:AUTHORED]->() RETURN count(r) as count",
-            'has_keyword': "MATCH ()-[r:HAS_KEYWORD]->() RETURN count(r) as count"
-        }
-        
-        counts = {}
-        for rel_type, query in queries.items():
-            result = self.client.execute_query(query)
-            counts[rel_type] = result[0]['count'] if result else 0
+        return self._execute_counts(self.RELATIONSHIP_COUNT_QUERIES, use_cache=True)
+    
+    def _execute_counts(self, queries: Dict[str, str], use_cache: bool = False) -> Dict[str, int]:
+        """Run several count queries in a single round-trip
         
-        return counts
+        Args:
+            queries: Mapping of result key to a query returning one `count` column
+            use_cache: Serve the combined query from the result cache when fresh
+            
+        Returns:
+            Dictionary with the count for each key (0 when no row is returned)
+        """
+        union_query = _build_count_query(queries)
+        if use_cache:
+            result = self._cached_query(union_query)
+        else:
+            result = self.client.execute_query(union_query)
+        counts = {record['key']: record['count'] for record in result}
+        return {key: counts.get(key, 0) for key in queries}
     
-    def verify_graph_integrity(self) -> Dict[str, Any]:
-        """Verify graph integrity and identify potential issues
+    def _cached_query(self, query: str, parameters: Optional[Dict] = None) -> List[Dict]:
+        """Execute a read query, reusing a cached result for identical queries
         
+        Args:
+            query: Cypher query string
+            parameters: Optional query parameters
+            
         Returns:
-            Dictionary with integrity check results
+            Query result records, possibly from the cache
         """
-        print("🔍 Verifying graph integrity...")
+        key = (query, tuple(sorted((parameters or {}).items())))
+        now = time.monotonic()
         
-        integrity_results = {
-            'timestamp': datetime.now().isoformat(),
-            'node_counts': self.get_node_counts(),
-            'relationship_counts': self.get_relationship_counts(),
-            'issues': []
-        }
+        with self._query_cache_lock:
+            cached = self._query_cache.get(key)
+            if cached and now - cached[0] < self.QUERY_CACHE_TTL_SECONDS:
+                return cached[1]
         
-        # Check for self-referential PART_OF relationships
-        self_ref_query = """
-        MATCH (child:Organization)-[r:PART_OF]->(parent:Organization)
-        WHERE child.id = parent.id
-        RETURN count(r) as self_ref_count
-        """
-        result = self.client.execute_query(self_ref_query)
-        self_ref_count = result[0]['self_ref_count'] if result else 0
+        result = self.client.execute_query(query, parameters)
         
-        if self_ref_count > 0:
-            integrity_results['issues'].append(f"Found {self_ref_count} self-referential PART_OF relationships")
-        else:
-            print("   ✅ No self-referential PART_OF relationships found")
+        with self._query_cache_lock:
+            if key not in self._query_cache and len(self._query_cache) >= self.QUERY_CACHE_MAX_ENTRIES:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._query_cache[next(iter(self._query_cache))]
+            self._query_cache[key] = (now, result)
+        
+        return result
+    
+    def _label_query(self, template_name: str, label: str) -> str:
+        """Get the query for a label from LABEL_QUERY_TEMPLATES, building it once
+        
+        Args:
+            template_name: Key in LABEL_QUERY_TEMPLATES
+            label: Node label or relationship type to substitute
+            
+        Returns:
+            Cypher query string, identical for every call with the same label
+        """
+        key = (template_name, label)
+        query = self._compiled.get(key)
+        if query is None:
+            if not self.LABEL_PATTERN.match(label):
+                raise ValueError(f"Invalid label or relationship type: {label!r}")
+            query = self.LABEL_QUERY_TEMPLATES[template_name].format(
+                label=label, batch_size=self.DELETE_BATCH_SIZE
+            )
+            self._compiled[key] = query
+        return query
+    
+    def invalidate_cache(self):
+        """Drop all cached query results, e.g. after the graph was modified"""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+    
+    def _run_concurrently(self, tasks: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """Run independent read tasks concurrently on the query executor
         
-        # Check for cycles in organizational hierarchy
-        cycle_query = """
-        MATCH path = (start:Organization)-[:PART_OF*2..10]->(start)
-        RETURN count(path) as cycle_count
+        Args:
+            tasks: Mapping of result key to a zero-argument callable
+            
+        Returns:
+            Dictionary with the result of each task, keyed like `tasks`
         """
-        result = self.client.execute_query(cycle_query)
-        cycle_count = result[0]['cycle_count'] if result else 0
+        futures = {self._executor.submit(task): key for key, task in tasks.items()}
+        results = {}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+        return results
+    
+    def verify_graph_integrity(self) -> Dict[str, Any]:
+        """Verify graph integrity and identify potential issues
         
-        if cycle_count > 0:
-            integrity_results['issues'].append(f"Found {cycle_count} cycles in organizational hierarchy")
-        else:
-            print("   ✅ No cycles in organizational hierarchy found")
-        
-        # Check for orphaned nodes (nodes without any relationships)
-        orphan_queries = {
-            'orphaned_persons': """
-                MATCH (p:Person)
-                WHERE NOT (p)-[:AUTHORED]->() AND NOT (p)-[:AFFILIATED_WITH]->()
-                RETURN count(p) as count
-            """,
-            'orphaned_publications': """
-                MATCH (pub:Publication)
-                WHERE NOT ()-[:AUTHORED]->(pub) AND NOT (pub)-[:HAS_KEYWORD]->()
-                RETURN count(pub) as count
-            """,
-            'orphaned_organizations': """
-                MATCH (o:Organization)
-                WHERE NOT (o)-[:PART_OF]->() AND NOT ()-[:PART_OF]->(o) AND NOT ()-[:AFFILIATED_WITH]->(o)
-                RETURN count(o) as count
-            """
+        Returns:
+            Dictionary with integrity check results
+        """
+        logger.info("🔍 Verifying graph integrity...")
+        
+        # Self-reference, cycle, orphan and data quality checks, in reporting
+        # order. The count checks come from INTEGRITY_CHECKS_QUERY; cycles are
+        # found in Python from the PART_OF edges.
+        checks = {
+            'self_referential_part_of': "self-referential PART_OF relationships",
+            'hierarchy_cycles': "cycles in organizational hierarchy",
+            'orphaned_persons': "orphaned_persons",
+            'orphaned_publications': "orphaned_publications",
+            'orphaned_organizations': "orphaned_organizations",
+            'persons_without_display_name': "persons_without_display_name",
+            'publications_without_title': "publications_without_title",
+            'organizations_without_name': "organizations_without_name"
         }
         
-        for orphan_type, query in orphan_queries.items():
-            result = self.client.execute_query(query)
-            orphan_count = result[0]['count'] if result else 0
-            if orphan_count > 0:
-                integrity_results['issues'].append(f"Found {orphan_count} {orphan_type}")
-            else:
-                print(f"   ✅ No {orphan_type} found")
-        
-        # Check data quality
-        quality_checks = {
-            'persons_without_display_name': """
-                MATCH (p:Person)
-                WHERE p.displayName IS NULL OR p.displayName = ''
-                RETURN count(p) as count
-            """,
-            'publications_without_title': """
-                MATCH (pub:Publication)
-                WHERE pub.title IS NULL OR pub.title = ''
-                RETURN count(pub) as count
-            """,
-            'organizations_without_name': """
-                MATCH (o:Organization)
-                WHERE o.nameEng IS NULL OR o.nameEng = ''
-                RETURN count(o) as count
-            """
+        # Counts are read fresh: a cached empty count could otherwise report a
+        # graph loaded since then as passing
+        node_counts = self._execute_counts(self.NODE_COUNT_QUERIES, use_cache=False)
+        
+        # Without nodes there are no relationships and every check is zero
+        if not any(node_counts.values()):
+            logger.info("Graph is empty, skipping integrity checks")
+            logger.info("🎉 Graph integrity verification passed!")
+            return {
+                'timestamp': datetime.now().isoformat(),
+                'node_counts': node_counts,
+                'relationship_counts': dict.fromkeys(self.RELATIONSHIP_COUNT_QUERIES, 0),
+                'issues': []
+            }
+        
+        query_results = self._run_concurrently({
+            'relationship_counts': partial(self._execute_counts, self.RELATIONSHIP_COUNT_QUERIES, use_cache=False),
+            'checks': partial(self.client.execute_query, self.INTEGRITY_CHECKS_QUERY),
+            'part_of_edges': partial(self.client.execute_query, self.PART_OF_EDGES_QUERY)
+        })
+        
+        integrity_results = {
+            'timestamp': datetime.now().isoformat(),
+            'node_counts': node_counts,
+            'relationship_counts': query_results['relationship_counts'],
+            'issues': []
         }
+        check_counts = dict(query_results['checks'][0]) if query_results['checks'] else {}
+        check_counts['hierarchy_cycles'] = self._count_hierarchy_cycles(query_results['part_of_edges'])
         
-        for check_name, query in quality_checks.items():
-            result = self.client.execute_query(query)
-            issue_count = result[0]['count'] if result else 0
+        for check_name, description in checks.items():
+            issue_count = check_counts.get(check_name, 0)
             if issue_count > 0:
-                integrity_results['issues'].append(f"Found {issue_count} {check_name}")
+                integrity_results['issues'].append(f"Found {issue_count} {description}")
             else:
-                print(f"   ✅ No {check_name} found")
+                logger.info(f"✅ No {description} found")
         
         if not integrity_results['issues']:
-            print("   🎉 Graph integrity verification passed!")
+            logger.info("🎉 Graph integrity verification passed!")
         else:
-            print(f"   ⚠️  Found {len(integrity_results['issues'])} integrity issues")
+            logger.warning(f"⚠️  Found {len(integrity_results['issues'])} integrity issues")
         
         return integrity_results
     
+    @staticmethod
+    def _count_hierarchy_cycles(edges: List[Dict]) -> int:
+        """Count cycles among PART_OF edges with an iterative three-color DFS
+        
+        Self-references are reported by their own check and skipped here. Each
+        back edge closes at least one cycle, so the result is O(V+E) to compute.
+        
+        Args:
+            edges: Records with 'child_id' and 'parent_id' keys
+            
+        Returns:
+            Number of cycles detected
+        """
+        parents: Dict[str, List[str]] = {}
+        for edge in edges:
+            child_id, parent_id = edge['child_id'], edge['parent_id']
+            if child_id != parent_id:
+                parents.setdefault(child_id, []).append(parent_id)
+        
+        GRAY, BLACK = 1, 2
+        color: Dict[str, int] = {}
+        cycles = 0
+        for start in parents:
+            if start in color:
+                continue
+            color[start] = GRAY
+            stack = [(start, iter(parents[start]))]
+            while stack:
+                node, pending = stack[-1]
+                for parent_id in pending:
+                    state = color.get(parent_id)
+                    if state == GRAY:
+                        cycles += 1
+                    elif state is None:
+                        color[parent_id] = GRAY
+                        stack.append((parent_id, iter(parents.get(parent_id, ()))))
+                        break
+                else:
+                    color[node] = BLACK
+                    stack.pop()
+        
+        return cycles
+    
+    @staticmethod
+    def _max_hierarchy_depth(edges: List[Dict]) -> int:
+        """Length of the longest PART_OF chain, computed in O(V+E)
+        
+        Uses Kahn's algorithm from the roots down, so organizations caught in a
+        cycle are never reached and cannot make the walk loop.
+        
+        Args:
+            edges: Records with 'child_id' and 'parent_id' keys
+            
+        Returns:
+            Maximum number of PART_OF hops from an organization to its root
+        """
+        children: Dict[str, List[str]] = {}
+        parent_counts: Dict[str, int] = {}
+        for edge in edges:
+            child_id, parent_id = edge['child_id'], edge['parent_id']
+            children.setdefault(parent_id, []).append(child_id)
+            parent_counts[child_id] = parent_counts.get(child_id, 0) + 1
+        
+        # Each pass settles the organizations whose parents are all done, so the
+        # number of non-empty passes after the roots is the longest chain
+        frontier = [org_id for org_id in children if org_id not in parent_counts]
+        max_depth = -1
+        while frontier:
+            max_depth += 1
+            next_frontier = []
+            for org_id in frontier:
+                for child_id in children.get(org_id, ()):
+                    parent_counts[child_id] -= 1
+                    if parent_counts[child_id] == 0:
+                        next_frontier.append(child_id)
+            frontier = next_frontier
+        
+        return max(max_depth, 0)
+    
     def get_graph_statistics(self) -> Dict[str, Any]:
         """Get comprehensive graph statistics
         
         Returns:
             Dictionary with detailed graph statistics
         """
-        print("📊 Gathering graph statistics...")
+        logger.info("📊 Gathering graph statistics...")
+        
+        # Every statistics query is read uncached so one result never mixes
+        # figures from before and after a load; the skips rely on these counts
+        node_counts = self._execute_counts(self.NODE_COUNT_QUERIES, use_cache=False)
+        
+        # Skip the queries whose label is empty; their results are known.
+        # All remaining statistics queries are independent reads, so run them concurrently
+        queries = dict(self.STATISTICS_QUERIES, part_of_edges=self.PART_OF_EDGES_QUERY)
+        skipped = set()
+        if not node_counts['organizations']:
+            skipped.update(('hierarchy', 'part_of_edges'))
+        if not node_counts['publications']:
+            skipped.update(('year_dist', 'author_stats'))
+        if not node_counts['persons']:
+            skipped.add('person')
+        
+        tasks = {name: partial(self.client.execute_query, query) for name, query in queries.items() if name not in skipped}
+        if any(node_counts.values()):
+            tasks['relationships'] = partial(self._execute_counts, self.RELATIONSHIP_COUNT_QUERIES, use_cache=False)
+        results = self._run_concurrently(tasks)
         
         stats = {
             'timestamp': datetime.now().isoformat(),
-            'nodes': self.get_node_counts(),
-            'relationships': self.get_relationship_counts()
+            'nodes': node_counts,
+            'relationships': results.get('relationships') or dict.fromkeys(self.RELATIONSHIP_COUNT_QUERIES, 0)
         }
         
         # Organizational hierarchy statistics
         hierarchy_stats = {}
-        
-        # Root organizations (no parents)
-        root_query = """
-        MATCH (o:Organization)
-        WHERE NOT (o)-[:PART_OF]->()
-        RETURN count(o) as root_count
-        """
-        result = self.client.execute_query(root_query)
+        result = results.get('hierarchy')
         hierarchy_stats['root_organizations'] = result[0]['root_count'] if result else 0
-        
-        # Leaf organizations (no children)
-        leaf_query = """
-        MATCH (o:Organization)
-        WHERE NOT ()-[:PART_OF]->(o)
-        RETURN count(o) as leaf_count
-        """
-        result = self.client.execute_query(leaf_query)
         hierarchy_stats['leaf_organizations'] = result[0]['leaf_count'] if result else 0
-        
-        # Maximum hierarchy depth
-        depth_query = """
-        MATCH path = (leaf:Organization)-[:PART_OF*]->(root:Organization)
-        WHERE NOT (leaf)-[:PART_OF]->() AND NOT ()-[:PART_OF]->(root)
-        RETURN max(length(path)) as max_depth
-        """
-        result = self.client.execute_query(depth_query)
-        hierarchy_stats['max_hierarchy_depth'] = result[0]['max_depth'] if result else 0
+        hierarchy_stats['max_hierarchy_depth'] = self._max_hierarchy_depth(results.get('part_of_edges', []))
         
         stats['organizational_hierarchy'] = hierarchy_stats
         
         # Author and publication statistics
         pub_stats = {}
-        
-        # Publications per year distribution
-        year_dist_query = """
-        MATCH (pub:Publication)
-        WHERE pub.year IS NOT NULL
-        RETURN pub.year as year, count(pub) as count
-        ORDER BY year DESC
-        LIMIT 10
-        """
-        result = self.client.execute_query(year_dist_query)
-        pub_stats['publications_by_year'] = {record['year']: record['count'] for record in result}
-        
-        # Authors per publication statistics
-        author_stats_query = """
-        MATCH (pub:Publication)
-        OPTIONAL MATCH (p:Person)-[:AUTHORED]->(pub)
-        WITH pub, count(p) as author_count
-        RETURN 
-            min(author_count) as min_authors,
-            max(author_count) as max_authors,
-            avg(author_count) as avg_authors
-        """
-        result = self.client.execute_query(author_stats_query)
-        if result:
-            pub_stats.update(result[0])
+        pub_stats['publications_by_year'] = {record['year']: record['count'] for record in results.get('year_dist', [])}
+        if 'author_stats' in skipped:
+            # Aggregating over no publications yields nulls
+            pub_stats.update(min_authors=None, max_authors=None, avg_authors=None)
+        elif results['author_stats']:
+            pub_stats.update(results['author_stats'][0])
         
         stats['publications'] = pub_stats
         
         # Person statistics
         person_stats = {}
-        
-        # Persons with ORCID
-        orcid_query = """
-        MATCH (p:Person)
-        WHERE p.orcid IS NOT NULL
-        RETURN count(p) as orcid_count
-        """
-        result = self.client.execute_query(orcid_query)
+        result = results.get('person')
         person_stats['persons_with_orcid'] = result[0]['orcid_count'] if result else 0
-        
-        # Active affiliations
-        active_aff_query = """
-        MATCH (p:Person)-[r:AFFILIATED_WITH]->()
-        WHERE r.endDate IS NULL
-        RETURN count(r) as active_affiliations
-        """
-        result = self.client.execute_query(active_aff_query)
         person_stats['active_affiliations'] = result[0]['active_affiliations'] if result else 0
         
         stats['persons'] = person_stats
@@ -284,63 +523,105 @@ class GraphOperations:
         # Clear relationships first to avoid constraint violations
         if relationship_types:
             for rel_type in relationship_types:
-                query = f"MATCH ()-[r:{rel_type}]->() DELETE r RETURN count(r) as deleted"
+                query = self._label_query('delete_relationships', rel_type)
                 result = self.client.execute_write(query)
-                deleted_counts[f'{rel_type}_relationships'] = result.get('deleted', 0)
-                print(f"   🗑️  Deleted {deleted_counts[f'{rel_type}_relationships']} {rel_type} relationships")
+                deleted_counts[f'{rel_type}_relationships'] = result.get('relationships_deleted', 0)
+                logger.info(f"🗑️  Deleted {deleted_counts[f'{rel_type}_relationships']} {rel_type} relationships")
         
         # Clear nodes
         if entity_types:
             for entity_type in entity_types:
-                query = f"MATCH (n:{entity_type}) DELETE n RETURN count(n) as deleted"
+                query = self._label_query('delete_nodes', entity_type)
                 result = self.client.execute_write(query)
-                deleted_counts[f'{entity_type}_nodes'] = result.get('deleted', 0)
-                print(f"   🗑️  Deleted {deleted_counts[f'{entity_type}_nodes']} {entity_type} nodes")
+                deleted_counts[f'{entity_type}_nodes'] = result.get('nodes_deleted', 0)
+                logger.info(f"🗑️  Deleted {deleted_counts[f'{entity_type}_nodes']} {entity_type} nodes")
         
+        self.invalidate_cache()
         return deleted_counts
     
-    def export_graph_subset(self, entity_types: List[str] = None, limit: int = None) -> Dict[str, List[Dict]]:
+    def export_graph_subset(self, entity_types: List[str] = None, limit: int = None,
+                            materialize: bool = False) -> Union[Iterator[Tuple[str, Dict]], Dict[str, List[Dict]]]:
         """Export a subset of the graph for analysis or backup
         
         Args:
             entity_types: List of entity types to export
             limit: Maximum number of nodes per type to export
+            materialize: Collect everything into a dictionary instead of streaming
             
         Returns:
-            Dictionary with exported data
+            Iterator of (entity type key, node) pairs streamed from the database,
+            or a dictionary of node lists per entity type if `materialize` is set
         """
-        export_data = {}
-        
         if not entity_types:
             entity_types = ['Organization', 'Person', 'Publication']
         
+        records = self._stream_graph_subset(entity_types, limit)
+        if not materialize:
+            return records
+        
+        export_data = {entity_type.lower(): [] for entity_type in entity_types}
+        for key, node in records:
+            export_data[key].append(node)
+        
+        return export_data
+    
+    def _stream_graph_subset(self, entity_types: List[str], limit: Optional[int]) -> Iterator[Tuple[str, Dict]]:
+        """Yield (entity type key, node) pairs one record at a time"""
         for entity_type in entity_types:
-            query = f"MATCH (n:{entity_type}) RETURN n"
             if limit:
-                query += f" LIMIT {limit}"
+                query = self._label_query('export_nodes_limited', entity_type)
+            else:
+                query = self._label_query('export_nodes', entity_type)
             
-            result = self.client.execute_query(query)
-            export_data[entity_type.lower()] = [record['n'] for record in result]
-            print(f"   📤 Exported {len(export_data[entity_type.lower()])} {entity_type} nodes")
-        
-        return export_data
+            key = entity_type.lower()
+            exported = 0
+            for record in self.client.stream_query(query, {'limit': limit}):
+                exported += 1
+                yield key, record['n']
+            logger.info(f"📤 Exported {exported} {entity_type} nodes")
     
     def close(self):
-        """Close Neo4j client connection"""
+        """Shut down the query executor and close Neo4j client connection"""
+        self._executor.shutdown(wait=True)
         self.client.close()
 
 
+# GraphOperations shared by the standalone functions below, so repeated calls
+# reuse one driver and its connection pool instead of reconnecting each time
+_SHARED_OPS: Optional[GraphOperations] = None
+_SHARED_OPS_LOCK = threading.Lock()
+
+
+def _get_shared_ops() -> GraphOperations:
+    """Get or create the GraphOperations instance shared by standalone functions"""
+    global _SHARED_OPS
+    
+    if _SHARED_OPS is None:
+        # Concurrent first callers must not each build a client and executor
+        with _SHARED_OPS_LOCK:
+            if _SHARED_OPS is None:
+                _SHARED_OPS = GraphOperations()
+    
+    return _SHARED_OPS
+
+
+@atexit.register
+def _close_shared_ops():
+    """Close the shared GraphOperations instance at interpreter exit"""
+    global _SHARED_OPS
+    with _SHARED_OPS_LOCK:
+        if _SHARED_OPS:
+            _SHARED_OPS.close()
+            _SHARED_OPS = None
+
+
 def verify_graph_state() -> Dict[str, Any]:
     """Standalone function to verify graph state
     
     Returns:
         Graph verification results
     """
-    ops = GraphOperations()
-    try:
-        return ops.verify_graph_integrity()
-    finally:
-        ops.close()
+    return _get_shared_ops().verify_graph_integrity()
 
 
 def get_graph_statistics() -> Dict[str, Any]:
@@ -349,11 +630,7 @@ def get_graph_statistics() -> Dict[str, Any]:
     Returns:
         Graph statistics
     """
-    ops = GraphOperations()
-    try:
-        return ops.get_graph_statistics()
-    finally:
-        ops.close()
+    return _get_shared_ops().get_graph_statistics()
 
 
 def clear_graph_completely() -> Dict[str, int]:
@@ -361,23 +638,63 @@ def clear_graph_completely() -> Dict[str, int]:
     
     Returns:
         Counts of deleted items
+        
+    Raises:
+        RuntimeError: If apoc.periodic.iterate reports failed batches
+    """
+    ops = _get_shared_ops()
+    
+    logger.info("🗑️  Clearing entire graph...")
+    
+    # Delete in batches so the server never holds the whole graph in one
+    # transaction: relationships first, then nodes
+    iterate_query = """
+    CALL apoc.periodic.iterate($match, $action, {batchSize: $batch_size, parallel: false})
+    YIELD updateStatistics, failedBatches, errorMessages
+    RETURN updateStatistics, failedBatches, errorMessages
     """
-    ops = GraphOperations()
     try:
-        print("🗑️  Clearing entire graph...")
-        
-        # Clear all relationships first
-        rel_query = "MATCH ()-[r]->() DELETE r"
-        ops.client.execute_write(rel_query)
-        
-        # Clear all nodes
-        node_query = "MATCH (n) DELETE n"
-        result = ops.client.execute_write(node_query)
-        
-        print("   ✅ Graph cleared completely")
-        return {'deleted_nodes': result.get('counters', {}).get('nodes_deleted', 0)}
+        deleted = {'deleted_nodes': 0, 'deleted_relationships': 0}
+        for match, action in [("MATCH ()-[r]->() RETURN r", "DELETE r"),
+                              ("MATCH (n) RETURN n", "DETACH DELETE n")]:
+            result = ops.client.execute_query(
+                iterate_query,
+                {'match': match, 'action': action, 'batch_size': ops.DELETE_BATCH_SIZE}
+            )
+            row = result[0] if result else {}
+            update_stats = row.get('updateStatistics') or {}
+            deleted['deleted_nodes'] += update_stats.get('nodesDeleted', 0)
+            deleted['deleted_relationships'] += update_stats.get('relationshipsDeleted', 0)
+            
+            # apoc.periodic.iterate reports failed batches instead of raising
+            if row.get('failedBatches') or row.get('errorMessages'):
+                logger.error(f"Graph clear incomplete: {row.get('failedBatches')} failed batches "
+                             f"running '{action}': {row.get('errorMessages')}")
+                raise RuntimeError(
+                    f"Graph clear incomplete after deleting {deleted['deleted_nodes']} nodes and "
+                    f"{deleted['deleted_relationships']} relationships: {row.get('errorMessages')}"
+                )
+    except ClientError as e:
+        # Only a missing APOC procedure falls back; it fails before anything is
+        # deleted. Any other client error may hit mid-clear and is re-raised.
+        if e.code != 'Neo.ClientError.Procedure.ProcedureNotFound':
+            raise
+        logger.info(f"apoc.periodic.iterate unavailable ({e.code}), using CALL IN TRANSACTIONS")
+        rel_counts = ops.client.execute_write(
+            f"MATCH ()-[r]->() CALL {{ WITH r DELETE r }} IN TRANSACTIONS OF {ops.DELETE_BATCH_SIZE} ROWS"
+        )
+        node_counts = ops.client.execute_write(
+            f"MATCH (n) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {ops.DELETE_BATCH_SIZE} ROWS"
+        )
+        deleted = {
+            'deleted_nodes': node_counts.get('nodes_deleted', 0),
+            'deleted_relationships': rel_counts.get('relationships_deleted', 0) + node_counts.get('relationships_deleted', 0)
+        }
     finally:
-        ops.close()
+        ops.invalidate_cache()
+    
+    logger.info("✅ Graph cleared completely")
+    return deleted
 
 
 def get_node_counts() -> Dict[str, int]:
@@ -386,22 +703,24 @@ def get_node_counts() -> Dict[str, int]:
     Returns:
         Dictionary with node counts
     """
-    ops = GraphOperations()
-    try:
-        return ops.get_node_counts()
-    finally:
-        ops.close()
+    return _get_shared_ops().get_node_counts()
 
 
 if __name__ == "__main__":
     """CLI interface for graph operations"""
     import sys
     
-    if len(sys.argv) < 2:
-        print("Usage: python graph_operations.py [verify|stats|counts|clear]")
+    args = [arg for arg in sys.argv[1:] if arg != "--quiet"]
+    quiet = len(args) != len(sys.argv) - 1
+    
+    if not args:
+        print("Usage: python graph_operations.py [--quiet] [verify|stats|counts|clear]")
         sys.exit(1)
     
-    command = sys.argv[1].lower()
+    # Progress messages go through the module logger; --quiet keeps only warnings
+    logging.basicConfig(level=logging.WARNING if quiet else logging.INFO, format="%(message)s")
+    
+    command = args[0].lower()
     
     if command == "verify":
         results = verify_graph_state()
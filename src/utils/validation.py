@@ -2,7 +2,8 @@
 Validation utilities for data integrity and relationship validation.
 """
 
-from typing import List, Dict, Set, Tuple, Optional
+from collections import defaultdict
+from typing import List, Dict, FrozenSet, Set, Tuple, Optional, NamedTuple
 import logging
 
 from ..models.organization import OrganizationHierarchy
@@ -10,6 +11,14 @@ from ..models.organization import OrganizationHierarchy
 logger = logging.getLogger(__name__)
 
 
+class HierarchyError(NamedTuple):
+    """Structured hierarchy validation error."""
+    
+    kind: str  # 'self_reference', 'cycle' or 'multiple_parents'
+    org_id: Optional[str]
+    detail: str
+
+
 def validate_hierarchy(relationships: List[OrganizationHierarchy]) -> Tuple[bool, List[str]]:
     """
     Validate organizational hierarchy for cycles and self-references.
@@ -17,112 +26,246 @@ def validate_hierarchy(relationships: List[OrganizationHierarchy]) -> Tuple[bool
     Returns:
         Tuple of (is_valid, list_of_errors)
     """
-    errors = []
+    is_valid, errors = validate_hierarchy_detailed(relationships)
+    return is_valid, [error.detail for error in errors]
+
+
+def validate_hierarchy_detailed(relationships: List[OrganizationHierarchy]) -> Tuple[bool, List[HierarchyError]]:
+    """
+    Validate organizational hierarchy, returning structured errors.
     
-    # 1. Check for self-references (critical issue to fix)
-    self_refs = []
-    for rel in relationships:
-        if rel.childId == rel.parentId:
-            self_refs.append(rel.childId)
-            errors.append(f"CRITICAL: Self-reference detected - {rel.childId} is parent of itself")
+    Returns:
+        Tuple of (is_valid, list_of_hierarchy_errors)
+    """
+    errors = []
     
-    # 2. Build parent-child mapping for cycle detection
+    # 1. Single pass over the relationships: flag self-references (critical
+    # issue to fix) and build the parent-child mapping and counters used by
+    # the cycle, multiple-parent and root checks below
     parent_map: Dict[str, str] = {}
-    child_counts: Dict[str, int] = {}
+    child_parent_count: Dict[str, int] = defaultdict(int)
+    all_child_ids: Set[str] = set()
+    all_parent_ids: Set[str] = set()
     
     for rel in relationships:
-        # Skip self-references for cycle detection
-        if rel.childId != rel.parentId:
-            parent_map[rel.childId] = rel.parentId
-            child_counts[rel.parentId] = child_counts.get(rel.parentId, 0) + 1
-    
-    # 3. Detect cycles using path traversal
-    cycles_detected = set()
-    
-    for child_id in parent_map:
-        if child_id in cycles_detected:
+        c, p = rel.childId, rel.parentId
+        if c == p:
+            errors.append(HierarchyError(
+                'self_reference', c,
+                f"CRITICAL: Self-reference detected - {c} is parent of itself"
+            ))
             continue
-            
-        visited = set()
-        path = []
-        current = child_id
         
-        # Traverse up the hierarchy
-        while current in parent_map:
-            if current in visited:
-                # Cycle detected
-                cycle_start = path.index(current)
-                cycle_path = path[cycle_start:] + [current]
-                cycle_str = " -> ".join(cycle_path)
-                errors.append(f"Cycle detected: {cycle_str}")
-                cycles_detected.update(cycle_path)
-                break
-            
-            visited.add(current)
-            path.append(current)
-            current = parent_map[current]
-    
-    # 4. Check for multiple parents (not necessarily an error, but worth noting)
-    children_with_multiple_parents = []
-    child_parent_count = {}
+        parent_map[c] = p
+        child_parent_count[c] += 1
+        all_child_ids.add(c)
+        all_parent_ids.add(p)
     
-    for rel in relationships:
-        if rel.childId != rel.parentId:  # Skip self-references
-            child_parent_count[rel.childId] = child_parent_count.get(rel.childId, 0) + 1
+    # 2. Detect cycles
+    for cycle_path in _detect_cycles(parent_map):
+        cycle_str = " -> ".join(cycle_path)
+        errors.append(HierarchyError('cycle', cycle_path[0], f"Cycle detected: {cycle_str}"))
     
+    # 3. Check for multiple parents (not necessarily an error, but worth noting)
+    children_with_multiple_parents = []
     for child_id, parent_count in child_parent_count.items():
         if parent_count > 1:
             children_with_multiple_parents.append(f"{child_id} has {parent_count} parents")
     
     if children_with_multiple_parents:
-        errors.append(f"WARNING: Organizations with multiple parents: {'; '.join(children_with_multiple_parents)}")
+        errors.append(HierarchyError(
+            'multiple_parents', None,
+            f"WARNING: Organizations with multiple parents: {'; '.join(children_with_multiple_parents)}"
+        ))
     
-    # 5. Check for orphaned organizations (those that are parents but have no parents themselves)
-    all_child_ids = {rel.childId for rel in relationships if rel.childId != rel.parentId}
-    all_parent_ids = {rel.parentId for rel in relationships if rel.childId != rel.parentId}
+    # 4. Check for orphaned organizations (those that are parents but have no parents themselves)
     root_organizations = all_parent_ids - all_child_ids
     
     logger.info(f"Hierarchy validation: {len(root_organizations)} root organizations found")
     
-    is_valid = len(errors) == 0 or all("WARNING:" in error for error in errors)
+    is_valid = all(error.kind == 'multiple_parents' for error in errors)
     
     return is_valid, errors
 
 
+def _detect_cycles(parent_map: Dict[str, str]) -> List[List[str]]:
+    """
+    Find the cycles in a child -> parent mapping with a three-color walk.
+    
+    IDs are interned to integers first so the walk runs over flat lists and a
+    bytearray of colors; each organization is walked at most once, O(V+E).
+    
+    Returns:
+        List of cycle paths, each starting and ending with the same ID
+    """
+    names = list(parent_map)
+    n_children = len(names)
+    index = {org_id: i for i, org_id in enumerate(names)}
+    
+    # Children take indices below n_children; parents that are never children
+    # are appended after them and end a walk
+    parent_idx = []
+    for parent_id in parent_map.values():
+        i = index.get(parent_id)
+        if i is None:
+            i = index[parent_id] = len(names)
+            names.append(parent_id)
+        parent_idx.append(i)
+    
+    GRAY, BLACK = 1, 2
+    color = bytearray(n_children)
+    stack_pos = [0] * n_children
+    cycles = []
+    
+    for start in range(n_children):
+        if color[start]:
+            continue
+        
+        path = []
+        current = start
+        
+        # Traverse up the hierarchy until a root or an already finished node
+        while current < n_children:
+            state = color[current]
+            if state == BLACK:
+                break
+            if state == GRAY:
+                cycles.append([names[i] for i in path[stack_pos[current]:]] + [names[current]])
+                break
+            
+            color[current] = GRAY
+            stack_pos[current] = len(path)
+            path.append(current)
+            current = parent_idx[current]
+        
+        for node in path:
+            color[node] = BLACK
+    
+    return cycles
+
+
 def prevent_cycles(existing_relationships: List[OrganizationHierarchy], 
                   new_relationship: OrganizationHierarchy) -> Tuple[bool, Optional[str]]:
     """
     Check if adding a new relationship would create a cycle.
     
+    For repeated checks against the same hierarchy use HierarchyValidator,
+    which keeps its parent mapping and ancestor sets between calls.
+    
     Returns:
         Tuple of (is_safe_to_add, error_message)
     """
-    # 1. Check for self-reference
-    if new_relationship.childId == new_relationship.parentId:
-        return False, f"Cannot add self-reference: {new_relationship.childId} -> {new_relationship.parentId}"
-    
-    # 2. Build existing parent-child mapping
-    parent_map = {}
-    for rel in existing_relationships:
-        if rel.childId != rel.parentId:  # Skip any existing self-references
-            parent_map[rel.childId] = rel.parentId
-    
-    # 3. Check if new relationship would create cycle
-    # Starting from the new parent, traverse up to see if we reach the new child
-    current = new_relationship.parentId
-    visited = set()
-    path = [new_relationship.childId, new_relationship.parentId]
-    
-    while current in parent_map and current not in visited:
-        visited.add(current)
-        current = parent_map[current]
-        path.append(current)
+    return HierarchyValidator(existing_relationships).check(new_relationship)
+
+
+class HierarchyValidator:
+    """Incremental cycle prevention against a persistent hierarchy.
+    
+    The child -> parent mapping is kept between calls and each organization's
+    ancestor set is cached on first use, so checking a candidate relationship
+    is O(1) once warm instead of rebuilding the mapping every time.
+    """
+    
+    def __init__(self, relationships: Optional[List[OrganizationHierarchy]] = None):
+        """Initialize from existing relationships (self-references are ignored)."""
+        self.parent_map: Dict[str, str] = {}
+        self._children: Dict[str, Set[str]] = defaultdict(set)
+        self._ancestors: Dict[str, FrozenSet[str]] = {}
+        
+        for rel in relationships or []:
+            if rel.childId != rel.parentId:  # Skip any existing self-references
+                self._set_parent(rel.childId, rel.parentId)
+    
+    def _set_parent(self, child_id: str, parent_id: str) -> None:
+        """Record child_id -> parent_id, replacing any previous parent."""
+        old_parent = self.parent_map.get(child_id)
+        if old_parent is not None:
+            self._children[old_parent].discard(child_id)
+        self.parent_map[child_id] = parent_id
+        self._children[parent_id].add(child_id)
+    
+    def ancestors_of(self, org_id: str) -> FrozenSet[str]:
+        """Get every organization reachable upwards from org_id (excluding itself unless in a cycle)."""
+        cached = self._ancestors.get(org_id)
+        if cached is not None:
+            return cached
+        
+        # Walk up until a root, a cached node or a node already on this walk
+        chain = []
+        on_chain = set()
+        current = org_id
+        while current in self.parent_map and current not in self._ancestors and current not in on_chain:
+            on_chain.add(current)
+            chain.append(current)
+            current = self.parent_map[current]
+        
+        if current in on_chain:
+            # Existing cycle: every node on it reaches all the others
+            cycle_start = chain.index(current)
+            ancestors = frozenset(chain[cycle_start:])
+            for node in chain[cycle_start:]:
+                self._ancestors[node] = ancestors
+            chain = chain[:cycle_start]
+        else:
+            ancestors = self._ancestors.get(current, frozenset())
         
-        if current == new_relationship.childId:
-            cycle_path = " -> ".join(path)
-            return False, f"Adding relationship would create cycle: {cycle_path}"
+        # Fill in the cache from the top of the chain downwards
+        for node in reversed(chain):
+            ancestors = ancestors | {current}
+            self._ancestors[node] = ancestors
+            current = node
+        
+        return self._ancestors.get(org_id, frozenset())
     
-    return True, None
+    def check(self, new_relationship: OrganizationHierarchy) -> Tuple[bool, Optional[str]]:
+        """
+        Check if adding a new relationship would create a cycle.
+        
+        Returns:
+            Tuple of (is_safe_to_add, error_message)
+        """
+        child_id, parent_id = new_relationship.childId, new_relationship.parentId
+        
+        # 1. Check for self-reference
+        if child_id == parent_id:
+            return False, f"Cannot add self-reference: {child_id} -> {parent_id}"
+        
+        # 2. The new relationship closes a cycle iff the child is already above the parent
+        if child_id not in self.ancestors_of(parent_id):
+            return True, None
+        
+        path = [child_id, parent_id]
+        current = parent_id
+        while current != child_id:
+            current = self.parent_map[current]
+            path.append(current)
+        
+        cycle_path = " -> ".join(path)
+        return False, f"Adding relationship would create cycle: {cycle_path}"
+    
+    def add(self, new_relationship: OrganizationHierarchy) -> Tuple[bool, Optional[str]]:
+        """
+        Add a relationship to the hierarchy if it does not create a cycle.
+        
+        Returns:
+            Tuple of (was_added, error_message)
+        """
+        is_safe, error = self.check(new_relationship)
+        if not is_safe:
+            return is_safe, error
+        
+        child_id = new_relationship.childId
+        self._set_parent(child_id, new_relationship.parentId)
+        
+        # The child's chain changed, so drop its cached ancestors and those of
+        # its descendants; descendants of an uncached node are never cached
+        pending = [child_id]
+        while pending:
+            node = pending.pop()
+            if self._ancestors.pop(node, None) is not None or node == child_id:
+                pending.extend(self._children.get(node, ()))
+        
+        return True, None
 
 
 def validate_relationship(relationship_type: str, source_id: str, target_id: str, 
@@ -170,6 +313,47 @@ def validate_relationship(relationship_type: str, source_id: str, target_id: str
     return True, None
 
 
+def _to_float(value) -> Tuple[bool, Optional[float]]:
+    """Convert a value to float; empty strings are skipped."""
+    if value == '':
+        return False, None
+    return True, float(value)
+
+
+def _to_int(value) -> Tuple[bool, Optional[int]]:
+    """Convert a value to int; empty strings are skipped."""
+    if value == '':
+        return False, None
+    return True, int(value)
+
+
+def _to_str(value) -> Tuple[bool, object]:
+    """Strip string values; blank strings and falsy non-strings are skipped."""
+    if isinstance(value, str):
+        value = value.strip()
+    return bool(value), value
+
+
+# Optional organization fields copied by clean_organization_data, in output
+# order, with the converter applied to each. Converters return (ok, value) and
+# raise ValueError/TypeError for values that cannot be converted.
+FIELD_CONVERTERS = {
+    'nameSwe': _to_str,
+    'displayNameEng': _to_str,
+    'displayNameSwe': _to_str,
+    'displayPathEng': _to_str,
+    'displayPathSwe': _to_str,
+    'level': _to_str,
+    'organizationType': _to_str,
+    'city': _to_str,
+    'country': _to_str,
+    'geoLat': _to_float,
+    'geoLong': _to_float,
+    'startYear': _to_int,
+    'endYear': _to_int,
+}
+
+
 def clean_organization_data(organizations: List[Dict]) -> List[Dict]:
     """
     Clean organization data to prevent common issues.
@@ -181,13 +365,14 @@ def clean_organization_data(organizations: List[Dict]) -> List[Dict]:
     seen_ids = set()
     
     for org in organizations:
+        raw_id = org.get('id')
+        org_id = str(raw_id).strip() if raw_id else ''
+        
         # Skip organizations without valid IDs
-        if not org.get('id') or not str(org['id']).strip():
+        if not org_id:
             logger.warning(f"Skipping organization without valid ID: {org}")
             continue
         
-        org_id = str(org['id']).strip()
-        
         # Skip duplicates
         if org_id in seen_ids:
             logger.warning(f"Skipping duplicate organization ID: {org_id}")
@@ -202,36 +387,20 @@ def clean_organization_data(organizations: List[Dict]) -> List[Dict]:
         }
         
         # Add optional fields if present and non-empty
-        optional_fields = [
-            'nameSwe', 'displayNameEng', 'displayNameSwe', 
-            'displayPathEng', 'displayPathSwe', 'level', 'organizationType',
-            'city', 'country', 'geoLat', 'geoLong', 'startYear', 'endYear'
-        ]
-        
-        for field in optional_fields:
-            if field in org and org[field] is not None:
-                value = org[field]
-                
-                # Handle numeric fields
-                if field in ['geoLat', 'geoLong'] and value != '':
-                    try:
-                        clean_org[field] = float(value)
-                    except (ValueError, TypeError):
-                        logger.warning(f"Invalid {field} for {org_id}: {value}")
-                        continue
-                
-                elif field in ['startYear', 'endYear'] and value != '':
-                    try:
-                        clean_org[field] = int(value)
-                    except (ValueError, TypeError):
-                        logger.warning(f"Invalid {field} for {org_id}: {value}")
-                        continue
-                
-                # Handle string fields
-                elif isinstance(value, str) and value.strip():
-                    clean_org[field] = value.strip()
-                elif value and not isinstance(value, str):
-                    clean_org[field] = value
+        org_get = org.get
+        for field, convert in FIELD_CONVERTERS.items():
+            value = org_get(field)
+            if value is None:
+                continue
+            
+            try:
+                ok, converted = convert(value)
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid {field} for {org_id}: {value}")
+                continue
+            
+            if ok:
+                clean_org[field] = converted
         
         cleaned.append(clean_org)
     
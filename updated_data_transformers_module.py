@@ -5,264 +5,391 @@ Maps ES _id to es_id while preserving display names for visualization
 """
 
 import os
+import sys
 import json
-from datetime import datetime, date
-from typing import Dict, List, Optional, Any
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from types import MappingProxyType
+from typing import Callable, Dict, Final, Iterator, List, Optional, Any, Tuple, final
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # Optional: faster parsing of raw ES payloads
+    orjson = None
+
+# Shared read-only defaults for missing nested fields, so a document without
+# them does not allocate a throwaway container. Never returned to callers.
+_EMPTY_TUPLE: Final = ()
+_EMPTY_DICT: Final = MappingProxyType({})
+
+
+def _intern_fields(table: Tuple[Tuple[str, str, Any], ...]) -> Tuple[Tuple[str, str, Any], ...]:
+    """Intern the key and field names of a mapping table so lookups hash once"""
+    return tuple((sys.intern(key), sys.intern(field), default) for key, field, default in table)
+
+
+_ES_ID_FIELD: Final = sys.intern('_id')
+_DOC_ID_FIELD: Final = sys.intern('Id')
+
+
+def _pick_id(es_doc: Dict[str, Any], es_id: Optional[str] = None) -> Optional[str]:
+    """Use the provided es_id, else the document's _id, else its Id field"""
+    return es_id or es_doc.get(_ES_ID_FIELD) or es_doc.get(_DOC_ID_FIELD)
+
+
+# Field mapping tables: (output key, ES field, default) for every property that
+# is copied straight from the ES document. Derived properties (IDs, identifiers,
+# nested fields, conversions, list defaults) are added by the transform methods.
+_PERSON_FIELDS: Final = _intern_fields((
+    # Display properties for visualization
+    ('display_name', 'DisplayName', None),
+    ('first_name', 'FirstName', None),
+    ('last_name', 'LastName', None),
+    
+    # Technical properties
+    ('is_active', 'IsActive', False),
+    ('is_deleted', 'IsDeleted', False),
+    ('has_publications', 'HasPublications', False),
+    ('has_projects', 'HasProjects', False),
+    ('has_organization_home', 'HasOrganizationHome', False),
+    
+    # Metadata
+    ('created_at', 'CreatedAt', None),
+    ('updated_at', 'UpdatedAt', None),
+    ('created_by', 'CreatedBy', None),
+    ('updated_by', 'UpdatedBy', None),
+    ('needs_attention', 'NeedsAttention', False),
+    
+    # Count fields
+    ('organization_home_count', 'OrganizationHomeCount', 0),
+    ('identifiers_count', 'IdentifiersCount', 0),
+))
+
+_PUBLICATION_FIELDS: Final = _intern_fields((
+    # Display properties for visualization
+    ('title', 'Title', None),
+    ('abstract', 'Abstract', None),
+    
+    # Publication details
+    ('year', 'Year', None),
+    
+    # Status flags
+    ('is_draft', 'IsDraft', False),
+    ('is_deleted', 'IsDeleted', False),
+    ('is_imported', 'IsImported', False),
+    ('has_organizations', 'HasOrganizations', False),
+    ('has_persons', 'HasPersons', False),
+    ('has_import_errors', 'HasImportErrors', False),
+    ('needs_attention', 'NeedsAttention', False),
+    
+    # Import matching
+    ('has_import_match_on_scopus_doi', 'HasImportMatchOnScopusDoi', False),
+    ('has_import_match_on_scopus_id', 'HasImportMatchOnScopusId', False),
+    
+    # URLs
+    ('details_url_eng', 'DetailsUrlEng', None),
+    ('details_url_swe', 'DetailsUrlSwe', None),
+    
+    # Metadata
+    ('created_date', 'CreatedDate', None),
+    ('updated_date', 'UpdatedDate', None),
+    ('created_by', 'CreatedBy', None),
+    ('updated_by', 'UpdatedBy', None),
+    ('validated_by', 'ValidatedBy', None),
+    ('validated_date', 'ValidatedDate', None),
+    ('latest_event_date', 'LatestEventDate', None),
+))
+
+_ORGANIZATION_FIELDS: Final = _intern_fields((
+    # Display properties for visualization
+    ('display_name_eng', 'DisplayNameEng', None),
+    ('display_name_swe', 'DisplayNameSwe', None),
+    ('name_eng', 'NameEng', None),
+    ('name_swe', 'NameSwe', None),
+    
+    # Hierarchy and structure
+    ('level', 'Level', None),
+    ('display_path_eng', 'DisplayPathEng', None),
+    ('display_path_swe', 'DisplayPathSwe', None),
+    ('display_path_short_eng', 'DisplayPathShortEng', None),
+    ('display_path_short_swe', 'DisplayPathShortSwe', None),
+    
+    # Geographic information
+    ('city', 'City', None),
+    ('country', 'Country', None),
+    ('postal_no', 'PostalNo', None),
+    
+    # Temporal information
+    ('start_year', 'StartYear', None),
+    ('end_year', 'EndYear', None),
+    
+    # Status flags
+    ('is_active', 'IsActive', False),
+    ('is_replaced_by_id', 'IsReplacedById', None),
+    ('has_identifiers', 'HasIdentifiers', False),
+    ('needs_attention', 'NeedsAttention', False),
+    
+    # Metadata
+    ('created_at', 'CreatedAt', None),
+    ('updated_at', 'UpdatedAt', None),
+    ('created_by', 'CreatedBy', None),
+    ('updated_by', 'UpdatedBy', None),
+    ('validated_by', 'ValidatedBy', None),
+    ('validated_date', 'ValidatedDate', None),
+    ('deleted_at', 'DeletedAt', None),
+    ('deleted_by', 'DeletedBy', None),
+    
+    # Counts
+    ('identifiers_count', 'IdentifiersCount', 0),
+))
+
+_PROJECT_FIELDS: Final = _intern_fields((
+    # Display properties for visualization
+    ('title', 'Title', None),
+    ('abstract', 'Abstract', None),
+    
+    # Project details
+    ('start_date', 'StartDate', None),
+    ('end_date', 'EndDate', None),
+    ('funding_amount', 'FundingAmount', None),
+    ('currency', 'Currency', None),
+    ('status', 'Status', None),
+    
+    # Metadata
+    ('created_at', 'CreatedAt', None),
+    ('updated_at', 'UpdatedAt', None),
+    ('created_by', 'CreatedBy', None),
+    ('updated_by', 'UpdatedBy', None),
+))
+
+_SERIAL_FIELDS: Final = _intern_fields((
+    # Display properties for visualization
+    ('title', 'Title', None),
+    ('publisher', 'Publisher', None),
+    
+    # Serial details
+    ('country', 'Country', None),
+    ('start_year', 'StartYear', None),
+    ('end_year', 'EndYear', None),
+    
+    # Status flags
+    ('is_open_access', 'IsOpenAccess', False),
+    ('is_peer_reviewed', 'IsPeerReviewed', False),
+    ('is_deleted', 'IsDeleted', False),
+    
+    # Metadata
+    ('created_date', 'CreatedDate', None),
+    ('updated_date', 'UpdatedDate', None),
+    ('created_by', 'CreatedBy', None),
+    ('updated_by', 'UpdatedBy', None),
+))
+
+
+# Per-kind schemas from which the transform functions are generated at import:
+#   fields      - mapping table of properties copied straight from the document
+#   truthy      - (output key, ES field) kept only when truthy, otherwise None
+#   floats      - (output key, ES field) converted to float when truthy
+#   nested      - ((output keys), parent field, (child fields)) read from a nested dict
+#   org_type    - output keys for the first OrganizationTypes entry's name and ID
+#   identifiers - (output key, direct ES field or None, identifier type)
+#   lists       - (output key, ES field) list properties defaulting to []
+_SCHEMAS: Final[Dict[str, Dict[str, Any]]] = {
+    'person': {
+        'fields': _PERSON_FIELDS,
+        'truthy': (('birth_year', 'BirthYear'),),
+        'identifiers': (
+            ('orcid', 'IdentifierOrcid', 'ORCID'),
+            ('scopus_author_id', None, 'SCOPUS_AUTHID'),
+            ('cid', 'IdentifierCid', 'CID'),
+            ('cpl_person_id', 'IdentifierCplPersonId', 'CPL_PERSONID'),
+        ),
+    },
+    'publication': {
+        'fields': _PUBLICATION_FIELDS,
+        'nested': (
+            (('publication_type', 'publication_type_id'), 'PublicationType', ('NameEng', 'Id')),
+            (('language', 'language_id'), 'Language', ('NameEng', 'Id')),
+        ),
+        'identifiers': (
+            ('doi', 'IdentifierDoi', 'DOI'),
+            ('scopus_id', 'IdentifierScopusId', 'SCOPUS_ID'),
+            ('pubmed_id', 'IdentifierPubmedId', 'PUBMED_ID'),
+            ('isbn', 'IdentifierIsbn', 'ISBN'),
+            ('cpl_pubid', 'IdentifierCplPubid', 'CPL_PUBID'),
+        ),
+        'lists': (('affiliated_ids_chalmers', 'AffiliatedIdsChalmers'),),
+    },
+    'organization': {
+        'fields': _ORGANIZATION_FIELDS,
+        'floats': (('geo_lat', 'GeoLat'), ('geo_long', 'GeoLong')),
+        'org_type': ('organization_type', 'organization_type_id'),
+        'identifiers': (
+            ('ldap_code', 'IdentifierLdapCode', 'LDAP_CODE'),
+            ('cpl_department_id', 'IdentifierCplDepartmentId', 'CPL_DEPARTMENT_ID'),
+            ('ror_id', None, 'ROR_ID'),
+            ('scopus_afid', None, 'SCOPUS_AFID'),
+        ),
+        'lists': (('active_organization_parent_ids', 'ActiveOrganizationParentIds'),),
+    },
+    'project': {
+        'fields': _PROJECT_FIELDS,
+    },
+    'serial': {
+        'fields': _SERIAL_FIELDS,
+        'identifiers': (
+            ('issn', None, 'ISSN'),
+            ('eissn', None, 'EISSN'),
+            ('scopus_source_id', None, 'SCOPUS_SOURCE_ID'),
+        ),
+        'nested': (
+            (('serial_type', 'serial_type_value'), 'Type', ('DescriptionEng', 'Value')),
+        ),
+    },
+}
+
+# Identifier types each kind reads, so the Identifiers array is scanned once
+# per document and only the wanted types are indexed
+for _schema in _SCHEMAS.values():
+    _schema['identifier_types'] = frozenset(
+        identifier_type for _, _, identifier_type in _schema.get('identifiers', ()))
+del _schema
+
+
+@final
 class UpdatedDataTransformer:
     """Transform Elasticsearch documents to Neo4j format with proper ID mapping"""
     
     @staticmethod
-    def transform_person(es_doc: Dict, es_id: str = None) -> Dict:
-        """Transform person document from ES to Neo4j format
+    def transform(kind: str, es_doc: Dict[str, Any], es_id: Optional[str] = None) -> Dict[str, Any]:
+        """Transform an ES document of the given kind to Neo4j format
         
         Args:
+            kind: Document kind, one of the keys of _SCHEMAS
             es_doc: The Elasticsearch document
             es_id: The Elasticsearch _id (if not in document)
         """
-        # Use provided es_id or extract from document
-        doc_id = es_id or es_doc.get('_id') or es_doc.get('Id')
+        return _TRANSFORMERS[kind](es_doc, es_id)
+    
+    @staticmethod
+    def transform_person(es_doc: Dict[str, Any], es_id: Optional[str] = None) -> Dict[str, Any]:
+        """Transform person document from ES to Neo4j format
         
-        return {
-            # Primary key: ES _id
-            'es_id': doc_id,
-            
-            # Display properties for visualization
-            'display_name': es_doc.get('DisplayName'),
-            'first_name': es_doc.get('FirstName'),
-            'last_name': es_doc.get('LastName'),
-            
-            # Technical properties
-            'birth_year': es_doc.get('BirthYear', 0) if es_doc.get('BirthYear') else None,
-            'is_active': es_doc.get('IsActive', False),
-            'is_deleted': es_doc.get('IsDeleted', False),
-            'has_publications': es_doc.get('HasPublications', False),
-            'has_projects': es_doc.get('HasProjects', False),
-            'has_organization_home': es_doc.get('HasOrganizationHome', False),
-            
-            # Identifiers
-            'orcid': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierOrcid', 'ORCID'),
-            'scopus_author_id': UpdatedDataTransformer._extract_identifier(es_doc, 'SCOPUS_AUTHID'),
-            'cid': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierCid', 'CID'),
-            'cpl_person_id': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierCplPersonId', 'CPL_PERSONID'),
-            
-            # Metadata
-            'created_at': es_doc.get('CreatedAt'),
-            'updated_at': es_doc.get('UpdatedAt'),
-            'created_by': es_doc.get('CreatedBy'),
-            'updated_by': es_doc.get('UpdatedBy'),
-            'needs_attention': es_doc.get('NeedsAttention', False),
-            
-            # Count fields
-            'organization_home_count': es_doc.get('OrganizationHomeCount', 0),
-            'identifiers_count': es_doc.get('IdentifiersCount', 0),
-        }
+        Args:
+            es_doc: The Elasticsearch document
+            es_id: The Elasticsearch _id (if not in document)
+        """
+        return UpdatedDataTransformer.transform('person', es_doc, es_id)
     
     @staticmethod
-    def transform_publication(es_doc: Dict, es_id: str = None) -> Dict:
+    def transform_publication(es_doc: Dict[str, Any], es_id: Optional[str] = None) -> Dict[str, Any]:
         """Transform publication document from ES to Neo4j format"""
-        doc_id = es_id or es_doc.get('_id') or es_doc.get('Id')
-        
-        return {
-            # Primary key: ES _id
-            'es_id': doc_id,
-            
-            # Display properties for visualization
-            'title': es_doc.get('Title'),
-            'abstract': es_doc.get('Abstract'),
-            
-            # Publication details
-            'year': es_doc.get('Year'),
-            'publication_type': UpdatedDataTransformer._extract_nested_field(es_doc, 'PublicationType', 'NameEng'),
-            'publication_type_id': UpdatedDataTransformer._extract_nested_field(es_doc, 'PublicationType', 'Id'),
-            'language': UpdatedDataTransformer._extract_nested_field(es_doc, 'Language', 'NameEng'),
-            'language_id': UpdatedDataTransformer._extract_nested_field(es_doc, 'Language', 'Id'),
-            
-            # Identifiers
-            'doi': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierDoi', 'DOI'),
-            'scopus_id': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierScopusId', 'SCOPUS_ID'),
-            'pubmed_id': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierPubmedId', 'PUBMED_ID'),
-            'isbn': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierIsbn', 'ISBN'),
-            'cpl_pubid': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierCplPubid', 'CPL_PUBID'),
-            
-            # Status flags
-            'is_draft': es_doc.get('IsDraft', False),
-            'is_deleted': es_doc.get('IsDeleted', False),
-            'is_imported': es_doc.get('IsImported', False),
-            'has_organizations': es_doc.get('HasOrganizations', False),
-            'has_persons': es_doc.get('HasPersons', False),
-            'has_import_errors': es_doc.get('HasImportErrors', False),
-            'needs_attention': es_doc.get('NeedsAttention', False),
-            
-            # Import matching
-            'has_import_match_on_scopus_doi': es_doc.get('HasImportMatchOnScopusDoi', False),
-            'has_import_match_on_scopus_id': es_doc.get('HasImportMatchOnScopusId', False),
-            
-            # URLs
-            'details_url_eng': es_doc.get('DetailsUrlEng'),
-            'details_url_swe': es_doc.get('DetailsUrlSwe'),
-            
-            # Metadata
-            'created_date': es_doc.get('CreatedDate'),
-            'updated_date': es_doc.get('UpdatedDate'),
-            'created_by': es_doc.get('CreatedBy'),
-            'updated_by': es_doc.get('UpdatedBy'),
-            'validated_by': es_doc.get('ValidatedBy'),
-            'validated_date': es_doc.get('ValidatedDate'),
-            'latest_event_date': es_doc.get('LatestEventDate'),
-            
-            # Chalmers-specific
-            'affiliated_ids_chalmers': es_doc.get('AffiliatedIdsChalmers', []),
-        }
+        return UpdatedDataTransformer.transform('publication', es_doc, es_id)
     
     @staticmethod
-    def transform_organization(es_doc: Dict, es_id: str = None) -> Dict:
+    def transform_organization(es_doc: Dict[str, Any], es_id: Optional[str] = None) -> Dict[str, Any]:
         """Transform organization document from ES to Neo4j format"""
-        doc_id = es_id or es_doc.get('_id') or es_doc.get('Id')
-        
-        return {
-            # Primary key: ES _id
-            'es_id': doc_id,
-            
-            # Display properties for visualization
-            'display_name_eng': es_doc.get('DisplayNameEng'),
-            'display_name_swe': es_doc.get('DisplayNameSwe'),
-            'name_eng': es_doc.get('NameEng'),
-            'name_swe': es_doc.get('NameSwe'),
-            
-            # Hierarchy and structure
-            'level': es_doc.get('Level'),
-            'display_path_eng': es_doc.get('DisplayPathEng'),
-            'display_path_swe': es_doc.get('DisplayPathSwe'),
-            'display_path_short_eng': es_doc.get('DisplayPathShortEng'),
-            'display_path_short_swe': es_doc.get('DisplayPathShortSwe'),
-            
-            # Geographic information
-            'city': es_doc.get('City'),
-            'country': es_doc.get('Country'),
-            'postal_no': es_doc.get('PostalNo'),
-            'geo_lat': float(es_doc.get('GeoLat')) if es_doc.get('GeoLat') else None,
-            'geo_long': float(es_doc.get('GeoLong')) if es_doc.get('GeoLong') else None,
-            
-            # Temporal information
-            'start_year': es_doc.get('StartYear'),
-            'end_year': es_doc.get('EndYear'),
-            
-            # Organization type
-            'organization_type': UpdatedDataTransformer._extract_first_org_type(es_doc),
-            'organization_type_id': UpdatedDataTransformer._extract_first_org_type_id(es_doc),
-            
-            # Identifiers
-            'ldap_code': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierLdapCode', 'LDAP_CODE'),
-            'cpl_department_id': UpdatedDataTransformer._extract_first_or_identifier(es_doc, 'IdentifierCplDepartmentId', 'CPL_DEPARTMENT_ID'),
-            'ror_id': UpdatedDataTransformer._extract_identifier(es_doc, 'ROR_ID'),
-            'scopus_afid': UpdatedDataTransformer._extract_identifier(es_doc, 'SCOPUS_AFID'),
-            
-            # Status flags
-            'is_active': es_doc.get('IsActive', False),
-            'is_replaced_by_id': es_doc.get('IsReplacedById'),
-            'has_identifiers': es_doc.get('HasIdentifiers', False),
-            'needs_attention': es_doc.get('NeedsAttention', False),
-            
-            # Parent organization references
-            'active_organization_parent_ids': es_doc.get('ActiveOrganizationParentIds', []),
-            
-            # Metadata
-            'created_at': es_doc.get('CreatedAt'),
-            'updated_at': es_doc.get('UpdatedAt'),
-            'created_by': es_doc.get('CreatedBy'),
-            'updated_by': es_doc.get('UpdatedBy'),
-            'validated_by': es_doc.get('ValidatedBy'),
-            'validated_date': es_doc.get('ValidatedDate'),
-            'deleted_at': es_doc.get('DeletedAt'),
-            'deleted_by': es_doc.get('DeletedBy'),
-            
-            # Counts
-            'identifiers_count': es_doc.get('IdentifiersCount', 0),
-        }
+        return UpdatedDataTransformer.transform('organization', es_doc, es_id)
     
     @staticmethod
-    def transform_project(es_doc: Dict, es_id: str = None) -> Dict:
+    def transform_project(es_doc: Dict[str, Any], es_id: Optional[str] = None) -> Dict[str, Any]:
         """Transform project document from ES to Neo4j format"""
-        doc_id = es_id or es_doc.get('_id') or es_doc.get('Id')
-        
-        return {
-            # Primary key: ES _id
-            'es_id': doc_id,
-            
-            # Display properties for visualization
-            'title': es_doc.get('Title'),
-            'abstract': es_doc.get('Abstract'),
-            
-            # Project details
-            'start_date': es_doc.get('StartDate'),
-            'end_date': es_doc.get('EndDate'),
-            'funding_amount': es_doc.get('FundingAmount'),
-            'currency': es_doc.get('Currency'),
-            'status': es_doc.get('Status'),
-            
-            # Metadata
-            'created_at': es_doc.get('CreatedAt'),
-            'updated_at': es_doc.get('UpdatedAt'),
-            'created_by': es_doc.get('CreatedBy'),
-            'updated_by': es_doc.get('UpdatedBy'),
-        }
+        return UpdatedDataTransformer.transform('project', es_doc, es_id)
     
     @staticmethod
-    def transform_serial(es_doc: Dict, es_id: str = None) -> Dict:
+    def transform_serial(es_doc: Dict[str, Any], es_id: Optional[str] = None) -> Dict[str, Any]:
         """Transform serial document from ES to Neo4j format"""
-        doc_id = es_id or es_doc.get('_id') or es_doc.get('Id')
+        return UpdatedDataTransformer.transform('serial', es_doc, es_id)
+    
+    # Batch helpers producing row lists for a single `UNWIND $rows` write
+    @staticmethod
+    def transform_persons_batch(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Transform a batch of person documents from ES to Neo4j rows"""
+        transform = UpdatedDataTransformer.transform_person
+        return [transform(doc) for doc in docs]
+    
+    @staticmethod
+    def transform_publications_batch(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Transform a batch of publication documents from ES to Neo4j rows"""
+        transform = UpdatedDataTransformer.transform_publication
+        return [transform(doc) for doc in docs]
+    
+    @staticmethod
+    def transform_organizations_batch(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Transform a batch of organization documents from ES to Neo4j rows"""
+        transform = UpdatedDataTransformer.transform_organization
+        return [transform(doc) for doc in docs]
+    
+    @staticmethod
+    def transform_batch(kind: str, docs: List[Dict[str, Any]], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Transform a batch of documents of one kind across worker processes
         
-        return {
-            # Primary key: ES _id
-            'es_id': doc_id,
-            
-            # Display properties for visualization
-            'title': es_doc.get('Title'),
-            'publisher': es_doc.get('Publisher'),
-            
-            # Serial details
-            'country': es_doc.get('Country'),
-            'start_year': es_doc.get('StartYear'),
-            'end_year': es_doc.get('EndYear'),
-            
-            # Identifiers
-            'issn': UpdatedDataTransformer._extract_identifier(es_doc, 'ISSN'),
-            'eissn': UpdatedDataTransformer._extract_identifier(es_doc, 'EISSN'),
-            'scopus_source_id': UpdatedDataTransformer._extract_identifier(es_doc, 'SCOPUS_SOURCE_ID'),
-            
-            # Classification
-            'serial_type': UpdatedDataTransformer._extract_nested_field(es_doc, 'Type', 'DescriptionEng'),
-            'serial_type_value': UpdatedDataTransformer._extract_nested_field(es_doc, 'Type', 'Value'),
-            
-            # Status flags
-            'is_open_access': es_doc.get('IsOpenAccess', False),
-            'is_peer_reviewed': es_doc.get('IsPeerReviewed', False),
-            'is_deleted': es_doc.get('IsDeleted', False),
-            
-            # Metadata
-            'created_date': es_doc.get('CreatedDate'),
-            'updated_date': es_doc.get('UpdatedDate'),
-            'created_by': es_doc.get('CreatedBy'),
-            'updated_by': es_doc.get('UpdatedBy'),
-        }
+        Args:
+            kind: Document kind, one of the keys of _SCHEMAS
+            docs: The Elasticsearch documents
+            workers: Number of worker processes, defaults to the CPU count;
+                with a single worker the batch is transformed in-process
+        """
+        workers = workers or os.cpu_count() or 1
+        transform = partial(UpdatedDataTransformer.transform, kind)
+        if workers == 1 or len(docs) < 2:
+            return [transform(doc) for doc in docs]
+        
+        chunksize = max(1, len(docs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(transform, docs, chunksize=chunksize))
+    
+    @staticmethod
+    def transform_persons_bytes(payload: bytes) -> List[Dict[str, Any]]:
+        """Parse a raw JSON array of person documents and transform it to Neo4j rows
+        
+        Args:
+            payload: JSON-encoded list of ES person documents, parsed with
+                orjson when it is installed and the json module otherwise
+        """
+        docs = orjson.loads(payload) if orjson is not None else json.loads(payload)
+        return UpdatedDataTransformer.transform_persons_batch(docs)
     
     # Helper methods for extracting nested data
     @staticmethod
-    def _extract_identifier(doc: Dict, identifier_type: str) -> Optional[str]:
-        """Extract specific identifier from identifiers array"""
-        identifiers = doc.get('Identifiers', [])
+    def _build_identifier_index(doc: Dict[str, Any], wanted: Optional[frozenset] = None) -> Dict[str, Any]:
+        """Map each identifier type in the identifiers array to its first value
+        
+        Args:
+            doc: The Elasticsearch document
+            wanted: Identifier types to index; all types are indexed if not given
+        """
+        index = {}
+        identifiers = doc.get('Identifiers', _EMPTY_TUPLE)
         for ident in identifiers:
-            if isinstance(ident, dict):
-                type_info = ident.get('Type', {})
-                if isinstance(type_info, dict) and type_info.get('Value') == identifier_type:
-                    return ident.get('Value')
-        return None
+            # Entries that are not dicts (or whose Type is not a dict) have no .get
+            try:
+                identifier_type = ident.get('Type', _EMPTY_DICT).get('Value')
+            except AttributeError:
+                continue
+            if identifier_type not in index and (wanted is None or identifier_type in wanted):
+                index[identifier_type] = ident.get('Value')
+        return index
+    
+    @staticmethod
+    def _extract_identifier(doc: Dict[str, Any], identifier_type: str,
+                            identifier_index: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Extract specific identifier from identifiers array
+        
+        Args:
+            doc: The Elasticsearch document
+            identifier_type: Identifier type to look up
+            identifier_index: Index from _build_identifier_index, built if not given
+        """
+        if identifier_index is None:
+            identifier_index = UpdatedDataTransformer._build_identifier_index(doc)
+        return identifier_index.get(identifier_type)
     
     @staticmethod
-    def _extract_first_or_identifier(doc: Dict, field_name: str, identifier_type: str) -> Optional[str]:
+    def _extract_first_or_identifier(doc: Dict[str, Any], field_name: str, identifier_type: str,
+                                     identifier_index: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """Extract from direct field first, then fall back to identifiers array"""
         # Try direct field first (e.g., IdentifierOrcid)
         direct_value = doc.get(field_name)
@@ -273,77 +400,140 @@ class UpdatedDataTransformer:
                 return direct_value
         
         # Fall back to identifiers array
-        return UpdatedDataTransformer._extract_identifier(doc, identifier_type)
+        return UpdatedDataTransformer._extract_identifier(doc, identifier_type, identifier_index)
     
     @staticmethod
-    def _extract_nested_field(doc: Dict, parent_field: str, child_field: str) -> Optional[str]:
-        """Extract nested field value"""
-        parent = doc.get(parent_field, {})
-        if isinstance(parent, dict):
-            return parent.get(child_field)
-        return None
+    def _extract_nested_pair(doc: Dict[str, Any], parent_field: str, child_a: str, child_b: str) -> Tuple[Optional[Any], Optional[Any]]:
+        """Extract two nested field values with a single parent lookup"""
+        parent = doc.get(parent_field, _EMPTY_DICT)
+        try:
+            return parent.get(child_a), parent.get(child_b)
+        except AttributeError:
+            return None, None
     
     @staticmethod
-    def _extract_first_org_type(doc: Dict) -> Optional[str]:
-        """Extract first organization type name"""
-        org_types = doc.get('OrganizationTypes', [])
-        if org_types and isinstance(org_types, list):
+    def _extract_first_org_type_pair(doc: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Extract first organization type name and ID"""
+        org_types = doc.get('OrganizationTypes', _EMPTY_TUPLE)
+        try:
             first_type = org_types[0]
-            if isinstance(first_type, dict):
-                return first_type.get('NameEng')
-        return None
+            return first_type.get('NameEng'), first_type.get('Id')
+        except (IndexError, KeyError, TypeError, AttributeError):
+            return None, None
+
+def _gen_transformer(kind: str, schema: Dict[str, Any]) -> Callable[..., Dict[str, Any]]:
+    """Compile a transform function for one document kind from its schema
     
-    @staticmethod
-    def _extract_first_org_type_id(doc: Dict) -> Optional[str]:
-        """Extract first organization type ID"""
-        org_types = doc.get('OrganizationTypes', [])
-        if org_types and isinstance(org_types, list):
-            first_type = org_types[0]
-            if isinstance(first_type, dict):
-                return first_type.get('Id')
-        return None
+    The generated function reads every field with a literal es_doc.get call,
+    so no schema interpretation happens per document.
+    
+    Args:
+        kind: Document kind, used to name the generated function
+        schema: The kind's entry in _SCHEMAS
+    """
+    lines = [f'def transform_{kind}(es_doc, es_id=None):', '    g = es_doc.get', '    row = {']
+    for key, field, default in schema['fields']:
+        getter = f'g({field!r})' if default is None else f'g({field!r}, {default!r})'
+        lines.append(f'        {key!r}: {getter},')
+    lines.append("        'es_id': _pick_id(es_doc, es_id),")
+    lines.append('    }')
+    
+    for key, field in schema.get('truthy', ()):
+        lines.append(f'    row[{key!r}] = value if (value := g({field!r})) else None')
+    
+    for key, field in schema.get('floats', ()):
+        lines += [
+            '    try:',
+            f'        row[{key!r}] = float(value) if (value := g({field!r})) else None',
+            '    except (TypeError, ValueError):',
+            f'        row[{key!r}] = None',
+        ]
+    
+    for (key_a, key_b), parent_field, (child_a, child_b) in schema.get('nested', ()):
+        lines.append(f'    row[{key_a!r}], row[{key_b!r}] = '
+                     f'_extract_nested_pair(es_doc, {parent_field!r}, {child_a!r}, {child_b!r})')
+    
+    org_type_keys = schema.get('org_type')
+    if org_type_keys:
+        lines.append(f'    row[{org_type_keys[0]!r}], row[{org_type_keys[1]!r}] = _extract_first_org_type_pair(es_doc)')
+    
+    identifier_specs = schema.get('identifiers')
+    if identifier_specs:
+        lines.append('    identifiers = _build_identifier_index(es_doc, identifier_types)')
+        for key, direct_field, identifier_type in identifier_specs:
+            if direct_field:
+                lines.append(f'    row[{key!r}] = _extract_first_or_identifier('
+                             f'es_doc, {direct_field!r}, {identifier_type!r}, identifiers)')
+            else:
+                lines.append(f'    row[{key!r}] = identifiers.get({identifier_type!r})')
+    
+    for key, field in schema.get('lists', ()):
+        lines.append(f'    row[{key!r}] = g({field!r}, [])')
+    
+    lines.append('    return row')
+    
+    namespace = {
+        '__name__': __name__,
+        '_pick_id': _pick_id,
+        '_extract_nested_pair': UpdatedDataTransformer._extract_nested_pair,
+        '_extract_first_org_type_pair': UpdatedDataTransformer._extract_first_org_type_pair,
+        '_build_identifier_index': UpdatedDataTransformer._build_identifier_index,
+        '_extract_first_or_identifier': UpdatedDataTransformer._extract_first_or_identifier,
+        'identifier_types': schema['identifier_types'],
+    }
+    exec(compile('\n'.join(lines), f'<transform_{kind}>', 'exec'), namespace)
+    return namespace[f'transform_{kind}']
+
 
+_TRANSFORMERS: Final = {kind: _gen_transformer(kind, schema) for kind, schema in _SCHEMAS.items()}
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string with microseconds and a Z suffix"""
+    now = time.time()
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))}.{int(now % 1 * 1_000_000):06d}Z"
+
+
+@final
 class UpdatedRelationshipExtractor:
     """Extract relationships from Elasticsearch documents with ES ID references"""
     
     @staticmethod
-    def extract_authorship_relationships(publication_docs: List[Dict]) -> List[Dict]:
-        """Extract AUTHORED relationships with ES ID references"""
-        relationships = []
+    def extract_authorship_relationships(publication_docs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Extract AUTHORED relationships with ES ID references, yielded one at a time"""
+        now_iso = _utc_now_iso()
         
         for pub_doc in publication_docs:
-            pub_es_id = pub_doc.get('_id') or pub_doc.get('Id')
-            persons = pub_doc.get('Persons', [])
+            pub_es_id = _pick_id(pub_doc)
+            persons = pub_doc.get('Persons', _EMPTY_TUPLE)
             
             for i, person in enumerate(persons):
-                person_data = person.get('PersonData', {})
+                person_data = person.get('PersonData', _EMPTY_DICT)
                 person_es_id = person_data.get('Id')
                 
                 if person_es_id and pub_es_id:
-                    relationships.append({
+                    yield {
                         'person_es_id': person_es_id,
                         'publication_es_id': pub_es_id,
                         'order': i + 1,
-                        'created_at': datetime.now().isoformat()
-                    })
-        
-        return relationships
+                        'created_at': now_iso
+                    }
     
     @staticmethod
-    def extract_affiliation_relationships(person_docs: List[Dict]) -> List[Dict]:
-        """Extract AFFILIATED_WITH relationships with ES ID references"""
-        relationships = []
+    def extract_affiliation_relationships(person_docs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Extract AFFILIATED_WITH relationships with ES ID references, yielded one at a time"""
+        now_iso = _utc_now_iso()
         
         for person_doc in person_docs:
-            person_es_id = person_doc.get('_id') or person_doc.get('Id')
-            org_homes = person_doc.get('OrganizationHome', [])
+            person_es_id = _pick_id(person_doc)
+            org_homes = person_doc.get('OrganizationHome', _EMPTY_TUPLE)
             
             for org_home in org_homes:
-                org_data = org_home.get('OrganizationData', {})
+                org_data = org_home.get('OrganizationData', _EMPTY_DICT)
                 org_es_id = org_data.get('Id')
                 
                 if person_es_id and org_es_id:
-                    relationships.append({
+                    yield {
                         'person_es_id': person_es_id,
                         'organization_es_id': org_es_id,
                         'start_date': org_home.get('StartDate'),
@@ -352,33 +542,29 @@ class UpdatedRelationshipExtractor:
                         'title_swe': org_home.get('TitleSwe'),
                         'priority': org_home.get('Priority'),
                         'source': org_home.get('Source'),
-                        'created_at': datetime.now().isoformat()
-                    })
-        
-        return relationships
+                        'created_at': now_iso
+                    }
     
     @staticmethod
-    def extract_organization_hierarchy(organization_docs: List[Dict]) -> List[Dict]:
-        """Extract PART_OF relationships for organizational hierarchy"""
-        relationships = []
+    def extract_organization_hierarchy(organization_docs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Extract PART_OF relationships for organizational hierarchy, yielded one at a time"""
+        now_iso = _utc_now_iso()
         
         for org_doc in organization_docs:
-            child_es_id = org_doc.get('_id') or org_doc.get('Id')
-            org_parents = org_doc.get('OrganizationParents', [])
+            child_es_id = _pick_id(org_doc)
+            org_parents = org_doc.get('OrganizationParents', _EMPTY_TUPLE)
             
             for parent_rel in org_parents:
                 parent_es_id = parent_rel.get('ParentOrganizationId')
                 
                 if child_es_id and parent_es_id:
-                    relationships.append({
+                    yield {
                         'child_es_id': child_es_id,
                         'parent_es_id': parent_es_id,
                         'from_date': parent_rel.get('FromDate'),
                         'to_date': parent_rel.get('ToDate'),
-                        'created_at': datetime.now().isoformat()
-                    })
-        
-        return relationships
+                        'created_at': now_iso
+                    }
 
 def main():
     """Test the updated transformers with sample data"""